@@ -2,3 +2,4 @@ from app.main import app
 
 # This is required for Vercel to find the app
 # Vercel looks for a variable named 'app' in the entry point
+# Keep this import light: see scripts/import_time_report.py for the cold-start budget
@@ -0,0 +1,144 @@
+"""
+Page-view analytics pipeline
+
+Ingestion only appends to an in-memory ring buffer. A background task drains
+it every analytics_flush_interval seconds (or once analytics_flush_events
+events are buffered) and, in one transaction, bulk-inserts the raw events and
+adds their counts to the hourly and daily rollup tables. Stats are read from
+the rollups, so their cost doesn't grow with the number of raw events.
+
+If the buffer fills faster than it is flushed the oldest events are dropped
+(counted in stats()) rather than blocking requests.
+"""
+import asyncio
+import logging
+from collections import Counter, deque
+from datetime import date, datetime, timedelta
+
+from sqlalchemy import insert, select
+
+from app.config import get_settings
+from app.database import AsyncSessionLocal, upsert
+from app.models.analytics import PageViewEvent, PageViewHourly, PageViewDaily
+
+logger = logging.getLogger(__name__)
+
+
+class AnalyticsBuffer:
+    def __init__(self):
+        self._events: deque = deque(maxlen=get_settings().analytics_buffer_size)
+        self._wake = asyncio.Event()
+        self._task: asyncio.Task | None = None
+        self._stopping = False
+        self._flush_lock = asyncio.Lock()
+        self.dropped = 0
+        self.flushes = 0
+        self.flushed_events = 0
+
+    def record(self, path: str, referrer: str | None = None):
+        """Buffer a page view; never touches the database"""
+        if len(self._events) == self._events.maxlen:
+            self.dropped += 1
+        self._events.append({"path": path, "referrer": referrer, "occurred_at": datetime.utcnow()})
+        if len(self._events) >= get_settings().analytics_flush_events:
+            self._wake.set()
+
+    async def flush(self) -> int:
+        """Write buffered events and their rollups in one transaction; returns events written"""
+        async with self._flush_lock:
+            if not self._events:
+                return 0
+            events = list(self._events)
+            self._events.clear()
+
+            hourly = Counter(e["occurred_at"].replace(minute=0, second=0, microsecond=0) for e in events)
+            daily = Counter(e["occurred_at"].date() for e in events)
+            try:
+                async with AsyncSessionLocal() as session:
+                    await session.execute(insert(PageViewEvent), events)
+                    await session.execute(_increment(session, PageViewHourly, "hour", hourly))
+                    await session.execute(_increment(session, PageViewDaily, "day", daily))
+                    await session.commit()
+            except Exception as e:
+                # Requeue ahead of newer events. If that overflows the buffer, drop
+                # the oldest failed events (extendleft would evict the newest ones)
+                overflow = len(events) + len(self._events) - self._events.maxlen
+                if overflow > 0:
+                    events = events[overflow:]
+                    self.dropped += overflow
+                self._events.extendleft(reversed(events))
+                logger.warning(f"Analytics flush failed, will retry: {e}")
+                return 0
+
+            self.flushes += 1
+            self.flushed_events += len(events)
+            return len(events)
+
+    async def _run(self):
+        interval = get_settings().analytics_flush_interval
+        while not self._stopping:
+            try:
+                await asyncio.wait_for(self._wake.wait(), timeout=interval)
+            except asyncio.TimeoutError:
+                pass
+            self._wake.clear()
+            await self.flush()
+
+    def start(self):
+        if self._task is None:
+            self._stopping = False
+            self._wake = asyncio.Event()  # Bound to the running loop
+            self._task = asyncio.create_task(self._run())
+
+    async def stop(self):
+        """Stop the background task and write whatever is still buffered"""
+        if self._task is not None:
+            self._stopping = True
+            self._wake.set()
+            await self._task
+            self._task = None
+        await self.flush()
+
+    def stats(self) -> dict:
+        return {
+            "buffered": len(self._events),
+            "dropped": self.dropped,
+            "flushes": self.flushes,
+            "flushed_events": self.flushed_events,
+        }
+
+
+def _increment(session, model, key: str, counts: Counter):
+    """Multi-row upsert adding counts to a rollup table"""
+    statement = upsert(session, model.__table__).values(
+        [{key: bucket, "views": views} for bucket, views in counts.items()]
+    )
+    return statement.on_conflict_do_update(
+        index_elements=[key],
+        set_={"views": model.__table__.c.views + statement.excluded.views},
+    )
+
+
+analytics_buffer = AnalyticsBuffer()
+
+
+async def daily_views(db, days: int = 7) -> list[tuple[date, int]]:
+    """Views for each of the last days UTC days (oldest first, zero-filled)"""
+    today = datetime.utcnow().date()
+    start = today - timedelta(days=days - 1)
+    result = await db.execute(
+        select(PageViewDaily.day, PageViewDaily.views).where(PageViewDaily.day >= start)
+    )
+    counts = dict(result.all())
+    return [(day, counts.get(day, 0)) for day in (start + timedelta(days=i) for i in range(days))]
+
+
+async def hourly_views(db, hours: int = 24) -> list[tuple[datetime, int]]:
+    """Views for each of the last hours UTC hours (oldest first, zero-filled)"""
+    current = datetime.utcnow().replace(minute=0, second=0, microsecond=0)
+    start = current - timedelta(hours=hours - 1)
+    result = await db.execute(
+        select(PageViewHourly.hour, PageViewHourly.views).where(PageViewHourly.hour >= start)
+    )
+    counts = dict(result.all())
+    return [(hour, counts.get(hour, 0)) for hour in (start + timedelta(hours=i) for i in range(hours))]
@@ -0,0 +1,105 @@
+"""In-process caches for rarely-changing content"""
+import asyncio
+import time
+from collections import OrderedDict
+
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.config import get_settings
+from app.models.content import Category
+from app.schemas import CategoryResponse
+
+
+class CategoryCache:
+    """
+    The whole categories table, loaded in one query and kept until a write
+    invalidates it (or content_cache_ttl expires, for other workers' writes)
+    """
+
+    def __init__(self):
+        self._categories: list[CategoryResponse] | None = None
+        self._by_id: dict[int, CategoryResponse] = {}
+        self._loaded_at = 0.0
+        self._lock = asyncio.Lock()
+
+    def _fresh(self) -> bool:
+        return (
+            self._categories is not None
+            and time.monotonic() - self._loaded_at < get_settings().content_cache_ttl
+        )
+
+    async def all(self, db: AsyncSession) -> list[CategoryResponse]:
+        if not self._fresh():
+            async with self._lock:
+                if not self._fresh():
+                    result = await db.execute(select(Category).order_by(Category.id))
+                    categories = [CategoryResponse.model_validate(c) for c in result.scalars().all()]
+                    self._by_id = {c.id: c for c in categories}
+                    self._categories = categories
+                    self._loaded_at = time.monotonic()
+        return self._categories
+
+    async def get(self, db: AsyncSession, category_id: int | None) -> CategoryResponse | None:
+        if category_id is None:
+            return None
+        await self.all(db)
+        category = self._by_id.get(category_id)
+        if category is None:
+            # Possibly created on another worker since the last load; reload once
+            self.invalidate()
+            await self.all(db)
+            category = self._by_id.get(category_id)
+        return category
+
+    def invalidate(self):
+        self._categories = None
+        self._by_id = {}
+
+
+category_cache = CategoryCache()
+
+
+class SlugCache:
+    """
+    Process-local slug -> serialized row index (LRU, with content_cache_ttl
+    expiry). Write handlers keep it coherent through put()/discard().
+    """
+
+    def __init__(self, max_entries: int = 2000):
+        self.max_entries = max_entries
+        self._entries: OrderedDict = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, slug: str):
+        entry = self._entries.get(slug)
+        if entry is None or time.monotonic() - entry[0] > get_settings().content_cache_ttl:
+            self._entries.pop(slug, None)
+            self.misses += 1
+            return None
+        self._entries.move_to_end(slug)
+        self.hits += 1
+        return entry[1]
+
+    def put(self, slug: str, value):
+        self._entries[slug] = (time.monotonic(), value)
+        self._entries.move_to_end(slug)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+
+    def discard(self, slug: str | None):
+        if slug is not None:
+            self._entries.pop(slug, None)
+
+    def discard_id(self, row_id: int):
+        """Drop the entry for a row whose old slug isn't known (e.g. after UPDATE ... RETURNING)"""
+        for slug in [slug for slug, (_, value) in self._entries.items() if value.id == row_id]:
+            del self._entries[slug]
+
+    def clear(self):
+        self._entries.clear()
+
+
+post_slug_cache = SlugCache()
+project_slug_cache = SlugCache()
@@ -0,0 +1,234 @@
+"""
+Newsletter campaign sender
+
+A campaign walks the active subscribers in id order, campaign_batch_size at a
+time (keyset, so memory stays flat for any list size). Each batch is sent
+concurrently over a dedicated SMTP pool of campaign_concurrency connections,
+paced by a campaign_rate_limit messages/second limiter. After each batch the
+per-recipient results and the new checkpoint (last_subscriber_id) are
+committed together, so a paused, crashed or restarted campaign resumes after
+the last finished batch (recipients of an unfinished batch may get it twice).
+
+Only one worker sends a campaign at a time: starting it claims a lease that
+the sender renews at every checkpoint, and campaigns left in "sending" by a
+stopped worker are picked up again at startup once the lease has expired.
+"""
+import asyncio
+import hashlib
+import hmac
+import html
+import logging
+import time
+from datetime import datetime, timedelta
+from string import Template
+from urllib.parse import urlencode
+
+from sqlalchemy import select, update, or_, and_, func
+
+from app.config import get_settings
+from app.database import AsyncSessionLocal, upsert
+from app.models.campaign import Campaign, CampaignDelivery
+from app.models.contact import Newsletter
+
+logger = logging.getLogger(__name__)
+
+
+def unsubscribe_token(email: str) -> str:
+    """HMAC of the address, so unsubscribe links can't be forged for other subscribers"""
+    key = get_settings().api_secret_key.encode()
+    return hmac.new(key, f"unsubscribe:{email.lower()}".encode(), hashlib.sha256).hexdigest()[:32]
+
+
+def verify_unsubscribe_token(email: str, token: str) -> bool:
+    return hmac.compare_digest(unsubscribe_token(email), token)
+
+
+def unsubscribe_url(email: str) -> str:
+    query = urlencode({"email": email, "token": unsubscribe_token(email)})
+    return f"{get_settings().public_api_url.rstrip('/')}/api/newsletter/unsubscribe?{query}"
+
+
+class RateLimiter:
+    """Spaces calls at least 1/rate seconds apart (rate <= 0 disables it)"""
+
+    def __init__(self, rate: float):
+        self.interval = 1.0 / rate if rate > 0 else 0.0
+        self._next = 0.0
+        self._lock = asyncio.Lock()
+
+    async def wait(self):
+        if not self.interval:
+            return
+        async with self._lock:
+            now = time.monotonic()
+            if self._next > now:
+                await asyncio.sleep(self._next - now)
+                now = self._next
+            self._next = now + self.interval
+
+
+class CampaignRunner:
+    def __init__(self):
+        self._tasks: dict[int, asyncio.Task] = {}
+        self._stopping = False
+
+    def is_running(self, campaign_id: int) -> bool:
+        return campaign_id in self._tasks
+
+    async def claim(self, campaign_id: int) -> bool:
+        """Mark the campaign as sending under this worker's lease; False if it can't be started"""
+        now = datetime.utcnow()
+        statement = (
+            update(Campaign)
+            .where(
+                Campaign.id == campaign_id,
+                or_(
+                    Campaign.status.in_(("draft", "paused")),
+                    and_(
+                        Campaign.status == "sending",
+                        or_(Campaign.lease_expires_at.is_(None), Campaign.lease_expires_at < now),
+                    ),
+                ),
+            )
+            .values(
+                status="sending",
+                lease_expires_at=now + timedelta(seconds=get_settings().campaign_lease_seconds),
+                started_at=func.coalesce(Campaign.started_at, func.now()),
+            )
+            .returning(Campaign.id)
+            .execution_options(synchronize_session=False)
+        )
+        async with AsyncSessionLocal() as session:
+            claimed = (await session.execute(statement)).first() is not None
+            await session.commit()
+        return claimed
+
+    async def start(self, campaign_id: int) -> bool:
+        """Claim and start sending in the background"""
+        if self.is_running(campaign_id) or not await self.claim(campaign_id):
+            return False
+        self._stopping = False
+        task = asyncio.create_task(self._run(campaign_id))
+        self._tasks[campaign_id] = task
+        task.add_done_callback(lambda _: self._tasks.pop(campaign_id, None))
+        return True
+
+    async def resume_pending(self):
+        """Restart campaigns left in "sending" whose lease has run out (at startup)"""
+        async with AsyncSessionLocal() as session:
+            result = await session.execute(select(Campaign.id).where(Campaign.status == "sending"))
+            campaign_ids = result.scalars().all()
+        for campaign_id in campaign_ids:
+            if await self.start(campaign_id):
+                logger.info(f"Resumed campaign {campaign_id}")
+
+    async def stop(self):
+        """Finish in-flight batches and checkpoint; campaigns stay "sending" and resume on next start"""
+        self._stopping = True
+        if self._tasks:
+            await asyncio.gather(*self._tasks.values(), return_exceptions=True)
+
+    async def _run(self, campaign_id: int):
+        # Imported here so the SMTP client isn't loaded on cold start
+        from app.email_service import SMTPPool, build_message
+
+        settings = get_settings()
+        pool = SMTPPool(size=settings.campaign_concurrency)
+        limiter = RateLimiter(settings.campaign_rate_limit)
+
+        async with AsyncSessionLocal() as session:
+            campaign = await session.get(Campaign, campaign_id)
+            subject = campaign.subject
+            text_template = Template(campaign.body_text)
+            html_template = Template(campaign.body_html) if campaign.body_html else None
+            checkpoint = campaign.last_subscriber_id
+
+        async def send_one(subscriber_id: int, email: str) -> dict:
+            await limiter.wait()
+            link = unsubscribe_url(email)
+            msg = build_message(
+                subject,
+                text_template.safe_substitute(email=email, unsubscribe_url=link),
+                html_template.safe_substitute(email=html.escape(email), unsubscribe_url=html.escape(link))
+                if html_template else None,
+                to=email,
+                headers={"List-Unsubscribe": f"<{link}>", "List-Unsubscribe-Post": "List-Unsubscribe=One-Click"},
+            )
+            try:
+                await pool.send(msg)
+                return {"campaign_id": campaign_id, "subscriber_id": subscriber_id, "email": email, "status": "sent", "error": None}
+            except Exception as e:
+                return {"campaign_id": campaign_id, "subscriber_id": subscriber_id, "email": email, "status": "failed", "error": f"{type(e).__name__}: {e}"}
+
+        try:
+            while not self._stopping:
+                async with AsyncSessionLocal() as session:
+                    result = await session.execute(
+                        select(Newsletter.id, Newsletter.email)
+                        .where(Newsletter.is_active == 1, Newsletter.id > checkpoint)
+                        .order_by(Newsletter.id)
+                        .limit(settings.campaign_batch_size)
+                    )
+                    batch = result.all()
+
+                if not batch:
+                    await self._finish(campaign_id, status="completed", completed_at=func.now(), lease_expires_at=None)
+                    logger.info(f"Campaign {campaign_id} completed")
+                    return
+
+                deliveries = await asyncio.gather(*(send_one(row.id, row.email) for row in batch))
+                checkpoint = batch[-1].id
+                if not await self._checkpoint(campaign_id, deliveries, checkpoint):
+                    logger.info(f"Campaign {campaign_id} paused at subscriber {checkpoint}")
+                    return
+
+            # Shutting down: let the next start resume without waiting for the lease
+            await self._finish(campaign_id, lease_expires_at=None)
+        except Exception as e:
+            logger.error(f"Campaign {campaign_id} stopped: {e}")
+        finally:
+            await pool.close()
+
+    async def _checkpoint(self, campaign_id: int, deliveries: list[dict], checkpoint: int) -> bool:
+        """Store a batch's results and advance the checkpoint; False once the campaign was paused"""
+        sent = sum(1 for d in deliveries if d["status"] == "sent")
+        async with AsyncSessionLocal() as session:
+            statement = upsert(session, CampaignDelivery.__table__).values(deliveries)
+            await session.execute(statement.on_conflict_do_update(
+                index_elements=["campaign_id", "subscriber_id"],
+                set_={"status": statement.excluded.status, "error": statement.excluded.error},
+            ))
+            # Counters and checkpoint always advance; the lease is only renewed while still sending
+            await session.execute(
+                update(Campaign)
+                .where(Campaign.id == campaign_id)
+                .values(
+                    last_subscriber_id=checkpoint,
+                    sent_count=Campaign.sent_count + sent,
+                    failed_count=Campaign.failed_count + len(deliveries) - sent,
+                )
+                .execution_options(synchronize_session=False)
+            )
+            renewed = await session.execute(
+                update(Campaign)
+                .where(Campaign.id == campaign_id, Campaign.status == "sending")
+                .values(lease_expires_at=datetime.utcnow() + timedelta(seconds=get_settings().campaign_lease_seconds))
+                .returning(Campaign.id)
+                .execution_options(synchronize_session=False)
+            )
+            still_sending = renewed.first() is not None
+            await session.commit()
+        return still_sending
+
+    async def _finish(self, campaign_id: int, **values):
+        async with AsyncSessionLocal() as session:
+            await session.execute(
+                update(Campaign)
+                .where(Campaign.id == campaign_id)
+                .values(**values)
+                .execution_options(synchronize_session=False)
+            )
+            await session.commit()
+
+
+campaign_runner = CampaignRunner()
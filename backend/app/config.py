@@ -1,6 +1,7 @@
+import re
 from pydantic_settings import BaseSettings
 from typing import List, Union, Any
-from pydantic import field_validator, AnyHttpUrl
+from pydantic import field_validator, AnyHttpUrl, AliasChoices, Field
 from functools import lru_cache
 
 
@@ -12,6 +13,7 @@ class Settings(BaseSettings):
     app_version: str = "1.0.0"
     debug: bool = True
     environment: str = "development"
+    serverless: bool = Field(False, validation_alias=AliasChoices("serverless", "vercel"))  # Vercel sets VERCEL=1
     
     # Server
     host: str = "0.0.0.0"
@@ -19,6 +21,26 @@ class Settings(BaseSettings):
     
     # Database
     database_url: str = "sqlite+aiosqlite:///./data/app.db"
+    database_replica_url: str = ""  # Optional read replica for GET endpoints
+    replica_max_lag_seconds: float = 5.0  # Fall back to the primary above this lag
+    replica_check_interval: float = 10.0  # Seconds between replica health checks
+    
+    # Connection pool
+    db_pool_mode: str = "auto"  # auto, queue, null (auto = null when serverless, queue otherwise)
+    db_pool_size: int = 5
+    db_max_overflow: int = 10
+    db_pool_timeout: float = 30.0  # Seconds to wait for a free connection
+    db_pool_recycle: int = 1800  # Seconds before a connection is replaced
+    db_pool_pre_ping: bool = True
+    db_pool_warmup: bool = False  # Open db_pool_size connections at startup
+    
+    # SQLite tuning (applied to every new SQLite connection)
+    sqlite_journal_mode: str = "WAL"
+    sqlite_synchronous: str = "NORMAL"  # Safe with WAL; FULL fsyncs every commit
+    sqlite_mmap_size: int = 268435456  # Bytes (256 MB)
+    sqlite_cache_size: int = -65536  # Negative = KiB (64 MB)
+    sqlite_busy_timeout: int = 5000  # Milliseconds to wait on a locked database
+    sqlite_read_pool_size: int = 4  # Read connections; writes go through a single connection
     
     # CORS
     frontend_url: str = "http://localhost:4000"
@@ -41,19 +63,62 @@ class Settings(BaseSettings):
             return [origin.strip() for origin in v.split(",")]
         return v
 
-    @field_validator("database_url", mode="before")
+    @field_validator("db_pool_mode")
+    @classmethod
+    def parse_db_pool_mode(cls, v: str) -> str:
+        v = v.lower()
+        if v not in ("auto", "queue", "null"):
+            raise ValueError("db_pool_mode must be one of: auto, queue, null")
+        return v
+
+    @field_validator("search_language")
+    @classmethod
+    def parse_search_language(cls, v: str) -> str:
+        # Interpolated into the search index DDL, so only allow a plain config name
+        if not re.fullmatch(r"[a-z_]+", v):
+            raise ValueError("search_language must be a text search config name ([a-z_]+)")
+        return v
+
+    @field_validator("database_url", "database_replica_url", mode="before")
     @classmethod
     def parse_database_url(cls, v: str) -> str:
         if v and v.startswith("postgresql://"):
             return v.replace("postgresql://", "postgresql+psycopg://", 1)
         return v
 
+    @property
+    def use_null_pool(self) -> bool:
+        """Whether connections should be opened per request instead of pooled"""
+        if self.db_pool_mode == "auto":
+            return self.serverless
+        return self.db_pool_mode == "null"
+
+    @property
+    def email_configured(self) -> bool:
+        """Whether SMTP notifications can be sent"""
+        return self.enable_email and bool(self.smtp_user) and bool(self.smtp_password)
+
     model_config = {
         "env_file": ".env",
         "case_sensitive": False,
         "extra": "ignore"
     }
     
+    # Caching
+    content_cache_ttl: int = 300  # Seconds before in-process content caches reload (bounds cross-worker staleness)
+    content_batch_max_items: int = 10000  # Max posts/projects per batch create/upsert request
+    markdown_cache_size: int = 256  # Rendered post bodies kept in memory, keyed by content hash
+    markdown_render_processes: int = 0  # Processes rendering batches/backfills (0 = all cores)
+    excerpt_length: int = 200  # Max characters of a post's auto_excerpt
+    reading_words_per_minute: int = 200  # For reading_time
+    content_cache_control: str = "public, max-age=60, s-maxage=300, stale-while-revalidate=600"  # For browsers and the Cloudflare edge
+    view_flush_interval: float = 10.0  # Seconds between batched Post.views writes
+    view_flush_events: int = 500  # Flush early once this many views are pending
+    analytics_buffer_size: int = 10000  # Ring buffer of unflushed page views (oldest dropped when full)
+    analytics_flush_interval: float = 5.0  # Seconds between batched event writes
+    analytics_flush_events: int = 1000  # Flush early once this many events are buffered
+    search_language: str = "simple"  # Postgres text search config; "simple" suits Vietnamese (no stemming)
+    
     # Email Configuration
     enable_email: bool = False  # Set to True when SMTP is configured
     smtp_host: str = "smtp.gmail.com"
@@ -62,9 +127,28 @@ class Settings(BaseSettings):
     smtp_password: str = ""  # Gmail App Password (not regular password)
     email_from: str = "Personal Website <noreply@daidataly.online>"
     email_to: str = "trantuandai2508@gmail.com"  # Recipient for contact form
+    email_digest_window: int = 0  # Seconds; >0 batches contact notifications into one digest per window
+    smtp_pool_size: int = 2  # Max concurrent SMTP connections (kept open between sends)
+    smtp_idle_timeout: float = 60.0  # Reconnect instead of reusing a connection idle this long
+    smtp_timeout: float = 30.0  # Seconds for connect/commands
+    public_api_url: str = "http://localhost:8000"  # Base URL of this API, for links in emails (unsubscribe)
+    campaign_batch_size: int = 200  # Subscribers per batch (and per checkpoint)
+    campaign_concurrency: int = 5  # SMTP connections used by a sending campaign
+    campaign_rate_limit: float = 20.0  # Messages per second (0 = unlimited)
+    campaign_lease_seconds: int = 120  # A campaign whose worker died is resumable after this
+    outbox_poll_interval: float = 30.0  # Seconds between outbox scans for retries (new mail wakes the worker)
+    outbox_batch_size: int = 20  # Messages claimed per scan
+    outbox_max_attempts: int = 8  # Then the message is dead-lettered
+    outbox_backoff_base: float = 30.0  # Retry delay doubles from this many seconds...
+    outbox_backoff_max: float = 3600.0  # ...up to this cap
+    outbox_lease_seconds: int = 300  # A claimed message is retried after this if its worker dies
     
     # Security
     api_secret_key: str = "dev-secret-key-change-in-production"
+    bcrypt_rounds: int = 12  # Cost factor; each +1 doubles hashing time
+    password_hash_workers: int = 2  # Threads hashing/verifying passwords (max concurrent bcrypt calls)
+    import_batch_size: int = 500  # Rows per transaction in bulk user imports
+    import_hash_processes: int = 0  # Processes hashing passwords during bulk imports (0 = all cores)
     
 
 
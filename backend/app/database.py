@@ -1,22 +1,262 @@
+import asyncio
+import logging
+import time
+from sqlalchemy import text, event, Insert, Update, Delete
 from sqlalchemy.ext.asyncio import create_async_engine, AsyncSession, async_sessionmaker
-from sqlalchemy.orm import DeclarativeBase
-from sqlalchemy.pool import NullPool
+from sqlalchemy.orm import DeclarativeBase, Session
+from sqlalchemy.dialects.postgresql import insert as postgresql_insert
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
+from sqlalchemy.pool import NullPool, AsyncAdaptedQueuePool
 from app.config import get_settings
 
+logger = logging.getLogger(__name__)
+
 settings = get_settings()
 
-# Create async engine with NullPool (no pooling for serverless)
-engine = create_async_engine(
-    settings.database_url,
-    echo=settings.debug,
-    future=True,
-    poolclass=NullPool,  # Disable connection pooling for Lambda
-)
 
-# Create session factory
+class PoolMetrics:
+    """Checkout timings collected by InstrumentedQueuePool"""
+
+    def __init__(self):
+        self.checkouts = 0
+        self.total_checkout_seconds = 0.0
+        self.max_checkout_seconds = 0.0
+        self.timeouts = 0
+
+    def record(self, seconds: float, timed_out: bool = False):
+        self.checkouts += 1
+        self.total_checkout_seconds += seconds
+        self.max_checkout_seconds = max(self.max_checkout_seconds, seconds)
+        if timed_out:
+            self.timeouts += 1
+
+
+class InstrumentedQueuePool(AsyncAdaptedQueuePool):
+    """Queue pool that records how long each checkout waits for a connection"""
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.metrics = PoolMetrics()
+
+    def connect(self):
+        start = time.perf_counter()
+        timed_out = False
+        try:
+            return super().connect()
+        except Exception as e:
+            timed_out = "QueuePool limit" in str(e)
+            raise
+        finally:
+            self.metrics.record(time.perf_counter() - start, timed_out)
+
+
+def _is_sqlite_file(database_url: str) -> bool:
+    return database_url.startswith("sqlite") and ":memory:" not in database_url and database_url != "sqlite://"
+
+
+def use_sqlite_writer() -> bool:
+    """SQLite production mode: one writer connection plus a separate read pool"""
+    return _is_sqlite_file(settings.database_url) and not settings.use_null_pool
+
+
+def _engine_options(database_url: str, pool_size: int = None, max_overflow: int = None) -> dict:
+    """Pool arguments for the current deployment mode"""
+    if settings.use_null_pool:
+        # Serverless: every invocation may be a fresh process, so don't hold connections
+        return {"poolclass": NullPool}
+    if database_url.startswith("sqlite") and not _is_sqlite_file(database_url):
+        # In-memory SQLite lives inside one connection; keep the dialect default (StaticPool)
+        return {}
+    return {
+        "poolclass": InstrumentedQueuePool,
+        "pool_size": settings.db_pool_size if pool_size is None else pool_size,
+        "max_overflow": settings.db_max_overflow if max_overflow is None else max_overflow,
+        "pool_timeout": settings.db_pool_timeout,
+        "pool_recycle": settings.db_pool_recycle,
+        "pool_pre_ping": settings.db_pool_pre_ping,
+    }
+
+
+def _sqlite_pragmas(read_only: bool = False):
+    """Connect listener applying the SQLite tuning profile"""
+    pragmas = [
+        f"PRAGMA busy_timeout = {int(settings.sqlite_busy_timeout)}",
+        f"PRAGMA synchronous = {settings.sqlite_synchronous}",
+        f"PRAGMA cache_size = {int(settings.sqlite_cache_size)}",
+        f"PRAGMA mmap_size = {int(settings.sqlite_mmap_size)}",
+        "PRAGMA temp_store = MEMORY",
+    ]
+    if read_only:
+        pragmas.append("PRAGMA query_only = ON")
+    else:
+        # journal_mode is stored in the database file; only the writer needs to set it
+        pragmas.insert(0, f"PRAGMA journal_mode = {settings.sqlite_journal_mode}")
+
+    def _apply(dbapi_connection, connection_record):
+        cursor = dbapi_connection.cursor()
+        for pragma in pragmas:
+            cursor.execute(pragma)
+        cursor.close()
+
+    return _apply
+
+
+_engine = None
+_replica_engine = None
+_sqlite_read_engine = None
+
+
+def _create_engine(database_url: str, read_only: bool = False, **pool_overrides):
+    created = create_async_engine(
+        database_url,
+        echo=settings.debug,
+        future=True,
+        **_engine_options(database_url, **pool_overrides),
+    )
+    if _is_sqlite_file(database_url):
+        event.listen(created.sync_engine, "connect", _sqlite_pragmas(read_only))
+    return created
+
+
+def get_engine():
+    """Primary engine, created on first use so importing the app stays cheap"""
+    global _engine
+    if _engine is None:
+        if use_sqlite_writer():
+            # A single connection serializes writes; waiting requests queue in the pool
+            # instead of failing with "database is locked"
+            _engine = _create_engine(settings.database_url, pool_size=1, max_overflow=0)
+        else:
+            # Pooled for long-running servers, NullPool for serverless
+            _engine = _create_engine(settings.database_url)
+    return _engine
+
+
+def get_sqlite_read_engine():
+    """Read pool over the SQLite file (WAL lets it run alongside the writer), or None"""
+    global _sqlite_read_engine
+    if _sqlite_read_engine is None and use_sqlite_writer():
+        _sqlite_read_engine = _create_engine(
+            settings.database_url,
+            read_only=True,
+            pool_size=settings.sqlite_read_pool_size,
+            max_overflow=0,
+        )
+    return _sqlite_read_engine
+
+
+def get_replica_engine():
+    """Optional read replica engine for read-only routes, or None"""
+    global _replica_engine
+    if _replica_engine is None and settings.database_replica_url:
+        _replica_engine = _create_engine(settings.database_replica_url)
+        event.listen(_replica_engine.sync_engine, "handle_error", _replica_disconnect)
+    return _replica_engine
+
+
+async def dispose_engines():
+    """Close pooled connections of every engine created so far"""
+    for created in (_engine, _replica_engine, _sqlite_read_engine):
+        if created is not None:
+            await created.dispose()
+
+
+class ReplicaMonitor:
+    """Tracks whether the replica is reachable and within the allowed lag"""
+
+    def __init__(self):
+        self.healthy = False
+        self.lag_seconds = None
+        self.last_error = None
+        self.checked_at = 0.0
+        self._lock = asyncio.Lock()
+
+    async def is_usable(self) -> bool:
+        """Return cached replica health, re-probing once the check interval expires"""
+        if not settings.database_replica_url:
+            return False
+        if time.monotonic() - self.checked_at < settings.replica_check_interval:
+            return self.healthy
+        async with self._lock:
+            if time.monotonic() - self.checked_at >= settings.replica_check_interval:
+                await self._probe()
+        return self.healthy
+
+    async def _probe(self):
+        try:
+            async with asyncio.timeout(2):
+                async with get_replica_engine().connect() as conn:
+                    if conn.dialect.name == "postgresql":
+                        # Replay timestamp only counts while WAL is still being applied
+                        lag = await conn.scalar(text(
+                            "SELECT CASE WHEN pg_last_wal_receive_lsn() = pg_last_wal_replay_lsn() THEN 0 "
+                            "ELSE COALESCE(EXTRACT(EPOCH FROM now() - pg_last_xact_replay_timestamp()), 0) END"
+                        ))
+                    else:
+                        await conn.execute(text("SELECT 1"))
+                        lag = 0
+            self._set(lag is not None and float(lag) <= settings.replica_max_lag_seconds,
+                      float(lag) if lag is not None else None, None)
+        except Exception as e:
+            self._set(False, None, str(e))
+        self.checked_at = time.monotonic()
+
+    def mark_down(self, error: str):
+        """Stop routing to the replica until the next successful probe"""
+        self._set(False, None, error)
+        self.checked_at = time.monotonic()
+
+    def _set(self, healthy: bool, lag_seconds, error):
+        if healthy != self.healthy:
+            if healthy:
+                logger.info("Read replica is available, routing reads to it")
+            else:
+                logger.warning(f"Read replica unavailable, reads fall back to primary: {error or f'lag {lag_seconds}s'}")
+        self.healthy = healthy
+        self.lag_seconds = lag_seconds
+        self.last_error = error
+
+
+replica_monitor = ReplicaMonitor()
+
+
+def _replica_disconnect(context):
+    if context.is_disconnect:
+        replica_monitor.mark_down(str(context.original_exception))
+
+
+class PrimarySession(Session):
+    """Session bound lazily to the primary engine"""
+
+    def get_bind(self, mapper=None, clause=None, **kw):
+        return get_engine().sync_engine
+
+
+class RoutingSession(PrimarySession):
+    """Sends reads to the read engine until the session writes, then pins to the primary"""
+
+    def get_bind(self, mapper=None, clause=None, **kw):
+        if isinstance(clause, (Insert, Update, Delete)) or self._flushing:
+            self.info["wrote"] = True
+        read_engine = self.info.get("read_engine")
+        if read_engine is not None and not self.info.get("wrote"):
+            return read_engine.sync_engine
+        return super().get_bind(mapper, clause, **kw)
+
+
+# Create session factory (the engine itself is only built on first use)
 AsyncSessionLocal = async_sessionmaker(
-    engine,
     class_=AsyncSession,
+    sync_session_class=PrimarySession,
+    expire_on_commit=False,
+    autocommit=False,
+    autoflush=False
+)
+
+# Session factory for read-only routes (replica when healthy, primary otherwise)
+ReadSessionLocal = async_sessionmaker(
+    class_=AsyncSession,
+    sync_session_class=RoutingSession,
     expire_on_commit=False,
     autocommit=False,
     autoflush=False
@@ -31,6 +271,17 @@ class Base(DeclarativeBase):
 from app.models.contact import Contact, Newsletter
 from app.models.user import User
 from app.models.content import Category, Post, Project
+from app.models.analytics import PageViewEvent, PageViewHourly, PageViewDaily
+from app.models.outbox import EmailOutbox
+from app.models.campaign import Campaign, CampaignDelivery
+from app.search import init_search
+
+
+def upsert(db: AsyncSession, table):
+    """INSERT for the session's dialect, with on_conflict_do_update()/on_conflict_do_nothing()"""
+    if db.get_bind().dialect.name == "postgresql":
+        return postgresql_insert(table)
+    return sqlite_insert(table)
 
 
 async def get_db():
@@ -42,13 +293,112 @@ async def get_db():
             await session.close()
 
 
+async def get_read_engine():
+    """Engine for read-only work: healthy replica, else the SQLite read pool, else None (primary)"""
+    if await replica_monitor.is_usable():
+        return get_replica_engine()
+    return get_sqlite_read_engine()
+
+
+async def get_read_db():
+    """Dependency for read-only routes; uses the replica when it is healthy"""
+    async with ReadSessionLocal() as session:
+        session.info["read_engine"] = await get_read_engine()
+        try:
+            yield session
+        finally:
+            await session.close()
+
+
+def add_missing_columns(connection):
+    """
+    Add nullable columns that models gained after their table was created
+    (create_all only creates missing tables); run via conn.run_sync
+    """
+    from sqlalchemy import inspect
+    inspector = inspect(connection)
+    for table in Base.metadata.sorted_tables:
+        if not inspector.has_table(table.name):
+            continue
+        existing = {column["name"] for column in inspector.get_columns(table.name)}
+        for column in table.columns:
+            if column.name not in existing and column.nullable and column.server_default is None:
+                column_type = column.type.compile(dialect=connection.dialect)
+                connection.exec_driver_sql(f"ALTER TABLE {table.name} ADD COLUMN {column.name} {column_type}")
+                logger.info(f"Added column {table.name}.{column.name}")
+
+
 async def init_db():
     """Initialize database tables (non-blocking for serverless)"""
     try:
-        async with engine.begin() as conn:
+        async with get_engine().begin() as conn:
             await conn.run_sync(Base.metadata.create_all)
+            await conn.run_sync(add_missing_columns)
+            await conn.run_sync(init_search)
     except Exception as e:
         # In serverless, table creation might fail or timeout
         # Log the error but don't crash the app
         print(f"⚠️ Database initialization skipped: {e}")
         print("Tables will be created on first use if needed.")
+
+
+async def warm_up_pool():
+    """Open pool_size connections up front so the first requests skip the handshake"""
+    for target in (get_engine(), get_replica_engine(), get_sqlite_read_engine()):
+        if target is not None and isinstance(target.pool, InstrumentedQueuePool):
+            await _warm_up(target)
+
+
+async def _warm_up(engine):
+    # Hold all connections at once so the pool really grows to pool_size
+    connections = await asyncio.gather(*(engine.connect() for _ in range(engine.pool.size())))
+    try:
+        await asyncio.gather(*(conn.execute(text("SELECT 1")) for conn in connections))
+    finally:
+        for conn in connections:
+            await conn.close()
+
+
+def get_pool_status(target_engine=None) -> dict:
+    """Current pool occupancy and checkout timings"""
+    pool = (target_engine or get_engine()).pool
+    metrics = getattr(pool, "metrics", PoolMetrics())
+    status = {
+        "pool_class": type(pool).__name__,
+        "checkouts": metrics.checkouts,
+        "timeouts": metrics.timeouts,
+        "avg_checkout_ms": round(
+            metrics.total_checkout_seconds / metrics.checkouts * 1000, 3
+        ) if metrics.checkouts else 0.0,
+        "max_checkout_ms": round(metrics.max_checkout_seconds * 1000, 3),
+        "size": None,
+        "checked_in": None,
+        "checked_out": None,
+        "overflow": None,
+    }
+    if isinstance(pool, AsyncAdaptedQueuePool):
+        status.update(
+            size=pool.size(),
+            checked_in=pool.checkedin(),
+            checked_out=pool.checkedout(),
+            overflow=pool.overflow(),
+        )
+    return status
+
+
+def get_replica_status() -> dict:
+    """Replica health as last seen by the monitor"""
+    replica_engine = get_replica_engine()
+    return {
+        "configured": replica_engine is not None,
+        "healthy": replica_monitor.healthy,
+        "lag_seconds": replica_monitor.lag_seconds,
+        "last_error": replica_monitor.last_error,
+        "pool": get_pool_status(replica_engine) if replica_engine is not None else None,
+    }
+
+
+def get_sqlite_read_pool_status():
+    """Occupancy of the SQLite read pool, or None outside SQLite production mode"""
+    read_engine = get_sqlite_read_engine()
+    return get_pool_status(read_engine) if read_engine is not None else None
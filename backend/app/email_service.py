@@ -1,12 +1,114 @@
 import aiosmtplib
+import asyncio
+import time
+from email.message import Message
 from email.mime.text import MIMEText
 from email.mime.multipart import MIMEMultipart
 from app.config import get_settings
+from app.email_templates import render_contact, render_contact_digest
 import logging
 
 logger = logging.getLogger(__name__)
 
 
+class SMTPPool:
+    """
+    Authenticated SMTP connections kept open and reused across sends
+    
+    At most smtp_pool_size connections exist at once (callers wait for a free
+    one). Connections idle longer than smtp_idle_timeout are replaced before
+    use, since servers drop idle sessions; a send that finds the connection
+    closed by the server reconnects and retries once.
+    """
+    
+    def __init__(self, size: int | None = None):
+        self.size = size  # None = smtp_pool_size
+        self._idle: list[tuple[aiosmtplib.SMTP, float]] = []
+        self._slots: asyncio.Semaphore | None = None
+        self.handshakes = 0
+        self.sends = 0
+        self.failures = 0
+        self.total_send_ms = 0.0
+        self.max_send_ms = 0.0
+    
+    async def _connect(self) -> aiosmtplib.SMTP:
+        settings = get_settings()
+        client = aiosmtplib.SMTP(
+            hostname=settings.smtp_host,
+            port=settings.smtp_port,
+            username=settings.smtp_user,
+            password=settings.smtp_password,
+            start_tls=True,
+            timeout=settings.smtp_timeout,
+        )
+        await client.connect()  # TCP + STARTTLS + AUTH
+        self.handshakes += 1
+        return client
+    
+    async def _acquire(self) -> aiosmtplib.SMTP:
+        idle_timeout = get_settings().smtp_idle_timeout
+        while self._idle:
+            client, last_used = self._idle.pop()
+            if client.is_connected and time.monotonic() - last_used < idle_timeout:
+                return client
+            await self._discard(client)
+        return await self._connect()
+    
+    async def _discard(self, client: aiosmtplib.SMTP):
+        try:
+            if client.is_connected:
+                await client.quit()
+        except Exception:
+            client.close()
+    
+    async def send(self, msg: Message):
+        """Send a message over a pooled connection"""
+        if self._slots is None:
+            self._slots = asyncio.Semaphore(self.size or get_settings().smtp_pool_size)
+        
+        async with self._slots:
+            start = time.perf_counter()
+            client = await self._acquire()
+            try:
+                try:
+                    await client.send_message(msg)
+                except aiosmtplib.SMTPServerDisconnected:
+                    # The server closed a pooled connection; one fresh attempt
+                    client.close()
+                    client = await self._connect()
+                    await client.send_message(msg)
+            except Exception:
+                self.failures += 1
+                await self._discard(client)
+                raise
+            
+            self._idle.append((client, time.monotonic()))
+            elapsed_ms = (time.perf_counter() - start) * 1000
+            self.sends += 1
+            self.total_send_ms += elapsed_ms
+            self.max_send_ms = max(self.max_send_ms, elapsed_ms)
+    
+    async def close(self):
+        """QUIT every idle connection (on shutdown)"""
+        idle, self._idle = self._idle, []
+        for client, _ in idle:
+            await self._discard(client)
+    
+    def stats(self) -> dict:
+        return {
+            "pool_size": self.size or get_settings().smtp_pool_size,
+            "idle_connections": len(self._idle),
+            "handshakes": self.handshakes,
+            "sends": self.sends,
+            "failures": self.failures,
+            "avg_send_ms": round(self.total_send_ms / self.sends, 2) if self.sends else 0.0,
+            "max_send_ms": round(self.max_send_ms, 2),
+        }
+
+
+smtp_pool = SMTPPool()
+
+
 async def send_contact_email(name: str, email: str, subject: str, message: str) -> bool:
     """
     Send contact form submission via email
@@ -23,146 +125,70 @@ async def send_contact_email(name: str, email: str, subject: str, message: str)
     settings = get_settings()
     
     # Check if email is enabled and configured
-    if not settings.enable_email or not settings.smtp_user or not settings.smtp_password:
+    if not settings.email_configured:
         logger.warning("Email is not enabled or not configured properly")
         return False
     
     try:
-        # Create message
-        msg = MIMEMultipart('alternative')
-        msg['Subject'] = f"Contact Form: {subject}"
-        msg['From'] = settings.email_from
-        msg['To'] = settings.email_to
-        msg['Reply-To'] = email
-        
-        # Create HTML content
-        html_content = f"""
-        <!DOCTYPE html>
-        <html>
-        <head>
-            <style>
-                body {{
-                    font-family: Arial, sans-serif;
-                    line-height: 1.6;
-                    color: #333;
-                }}
-                .container {{
-                    max-width: 600px;
-                    margin: 0 auto;
-                    padding: 20px;
-                    background-color: #f9f9f9;
-                }}
-                .header {{
-                    background: linear-gradient(135deg, #667eea 0%, #764ba2 100%);
-                    color: white;
-                    padding: 20px;
-                    text-align: center;
-                    border-radius: 5px 5px 0 0;
-                }}
-                .content {{
-                    background-color: white;
-                    padding: 30px;
-                    border-radius: 0 0 5px 5px;
-                    box-shadow: 0 2px 5px rgba(0,0,0,0.1);
-                }}
-                .field {{
-                    margin-bottom: 20px;
-                }}
-                .field-label {{
-                    font-weight: bold;
-                    color: #667eea;
-                    margin-bottom: 5px;
-                }}
-                .field-value {{
-                    padding: 10px;
-                    background-color: #f5f5f5;
-                    border-left: 3px solid #667eea;
-                    border-radius: 3px;
-                }}
-                .message-content {{
-                    white-space: pre-wrap;
-                    word-wrap: break-word;
-                }}
-                .footer {{
-                    margin-top: 20px;
-                    padding-top: 20px;
-                    border-top: 1px solid #eee;
-                    font-size: 12px;
-                    color: #999;
-                    text-align: center;
-                }}
-            </style>
-        </head>
-        <body>
-            <div class="container">
-                <div class="header">
-                    <h1>📬 New Contact Form Submission</h1>
-                </div>
-                <div class="content">
-                    <div class="field">
-                        <div class="field-label">👤 Name:</div>
-                        <div class="field-value">{name}</div>
-                    </div>
-                    
-                    <div class="field">
-                        <div class="field-label">📧 Email:</div>
-                        <div class="field-value"><a href="mailto:{email}">{email}</a></div>
-                    </div>
-                    
-                    <div class="field">
-                        <div class="field-label">📝 Subject:</div>
-                        <div class="field-value">{subject}</div>
-                    </div>
-                    
-                    <div class="field">
-                        <div class="field-label">💬 Message:</div>
-                        <div class="field-value message-content">{message}</div>
-                    </div>
-                    
-                    <div class="footer">
-                        Sent from your personal website contact form
-                    </div>
-                </div>
-            </div>
-        </body>
-        </html>
-        """
-        
-        # Create plain text version
-        text_content = f"""
-        New Contact Form Submission
-        ============================
-        
-        Name: {name}
-        Email: {email}
-        Subject: {subject}
-        
-        Message:
-        {message}
-        
-        ---
-        Sent from your personal website contact form
-        """
-        
-        # Attach both versions
-        part1 = MIMEText(text_content, 'plain')
-        part2 = MIMEText(html_content, 'html')
-        msg.attach(part1)
-        msg.attach(part2)
-        
-        # Send email
-        await aiosmtplib.send(
-            msg,
-            hostname=settings.smtp_host,
-            port=settings.smtp_port,
-            username=settings.smtp_user,
-            password=settings.smtp_password,
-            start_tls=True,
-        )
-        
-        logger.info(f"Contact email sent successfully to {settings.email_to}")
+        await deliver_contact_email(name, email, subject, message)
         return True
-        
     except Exception as e:
         logger.error(f"Failed to send contact email: {str(e)}")
         return False
+
+
+def build_message(
+    subject: str,
+    text_content: str,
+    html_content: str | None = None,
+    to: str | None = None,
+    reply_to: str | None = None,
+    headers: dict | None = None,
+) -> MIMEMultipart:
+    """Multipart text (+ HTML) message from email_from, to email_to unless given"""
+    settings = get_settings()
+    msg = MIMEMultipart('alternative')
+    msg['Subject'] = subject
+    msg['From'] = settings.email_from
+    msg['To'] = to or settings.email_to
+    if reply_to:
+        msg['Reply-To'] = reply_to
+    for name, value in (headers or {}).items():
+        msg[name] = value
+    msg.attach(MIMEText(text_content, 'plain'))
+    if html_content:
+        msg.attach(MIMEText(html_content, 'html'))
+    return msg
+
+
+async def deliver_contact_email(name: str, email: str, subject: str, message: str):
+    """
+    Send a contact form notification, raising on any failure
+    
+    Used by the outbox worker, which retries failed deliveries.
+    """
+    settings = get_settings()
+    if not settings.email_configured:
+        raise RuntimeError("Email is not enabled or not configured properly")
+    
+    contact = {"name": name, "email": email, "subject": subject, "message": message}
+    msg = build_message(*render_contact(contact), reply_to=email)
+    
+    # Send email over a pooled connection (no handshake when one is idle)
+    await smtp_pool.send(msg)
+    
+    logger.info(f"Contact email sent successfully to {settings.email_to}")
+
+
+async def deliver_contact_digest(contacts: list[dict]):
+    """Send several contact submissions as one notification, raising on any failure"""
+    settings = get_settings()
+    if not settings.email_configured:
+        raise RuntimeError("Email is not enabled or not configured properly")
+    
+    # Reply-To only makes sense when every submission came from the same sender
+    senders = {contact["email"] for contact in contacts}
+    reply_to = senders.pop() if len(senders) == 1 else None
+    await smtp_pool.send(build_message(*render_contact_digest(contacts), reply_to=reply_to))
+    
+    logger.info(f"Contact digest of {len(contacts)} submissions sent to {settings.email_to}")
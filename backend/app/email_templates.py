@@ -0,0 +1,116 @@
+"""
+Email templates
+
+Templates are compiled once at import (string.Template) and rendered with
+every user-supplied value HTML-escaped in the HTML part, so form input can't
+inject markup into the notification.
+"""
+import html
+from string import Template
+
+_STYLE = """
+    body { font-family: Arial, sans-serif; line-height: 1.6; color: #333; }
+    .container { max-width: 600px; margin: 0 auto; padding: 20px; background-color: #f9f9f9; }
+    .header { background: linear-gradient(135deg, #667eea 0%, #764ba2 100%); color: white; padding: 20px; text-align: center; border-radius: 5px 5px 0 0; }
+    .content { background-color: white; padding: 30px; border-radius: 0 0 5px 5px; box-shadow: 0 2px 5px rgba(0,0,0,0.1); }
+    .entry { margin-bottom: 30px; padding-bottom: 10px; border-bottom: 1px solid #eee; }
+    .field { margin-bottom: 20px; }
+    .field-label { font-weight: bold; color: #667eea; margin-bottom: 5px; }
+    .field-value { padding: 10px; background-color: #f5f5f5; border-left: 3px solid #667eea; border-radius: 3px; }
+    .message-content { white-space: pre-wrap; word-wrap: break-word; }
+    .footer { margin-top: 20px; padding-top: 20px; border-top: 1px solid #eee; font-size: 12px; color: #999; text-align: center; }
+"""
+
+_PAGE = Template("""<!DOCTYPE html>
+<html>
+<head>
+    <style>$style</style>
+</head>
+<body>
+    <div class="container">
+        <div class="header">
+            <h1>$heading</h1>
+        </div>
+        <div class="content">
+            $body
+            <div class="footer">
+                Sent from your personal website contact form
+            </div>
+        </div>
+    </div>
+</body>
+</html>
+""")
+
+_CONTACT_HTML = Template("""
+            <div class="entry">
+                <div class="field">
+                    <div class="field-label">👤 Name:</div>
+                    <div class="field-value">$name</div>
+                </div>
+                <div class="field">
+                    <div class="field-label">📧 Email:</div>
+                    <div class="field-value"><a href="mailto:$email">$email</a></div>
+                </div>
+                <div class="field">
+                    <div class="field-label">📝 Subject:</div>
+                    <div class="field-value">$subject</div>
+                </div>
+                <div class="field">
+                    <div class="field-label">💬 Message:</div>
+                    <div class="field-value message-content">$message</div>
+                </div>
+            </div>
+""")
+
+_CONTACT_TEXT = Template("""Name: $name
+Email: $email
+Subject: $subject
+
+Message:
+$message
+""")
+
+_TEXT_PAGE = Template("""$heading
+============================
+
+$body
+---
+Sent from your personal website contact form
+""")
+
+
+def _one_line(value: str) -> str:
+    """Collapse newlines so a value is safe in a header"""
+    return " ".join(value.split())
+
+
+def _contact_html(contact: dict) -> str:
+    return _CONTACT_HTML.substitute({key: html.escape(str(contact[key])) for key in ("name", "email", "subject", "message")})
+
+
+def _contact_text(contact: dict) -> str:
+    return _CONTACT_TEXT.substitute({key: contact[key] for key in ("name", "email", "subject", "message")})
+
+
+def render_contact(contact: dict) -> tuple[str, str, str]:
+    """(subject, text, html) for one contact form submission"""
+    heading = "📬 New Contact Form Submission"
+    return (
+        f"Contact Form: {_one_line(contact['subject'])}",
+        _TEXT_PAGE.substitute(heading="New Contact Form Submission", body=_contact_text(contact)),
+        _PAGE.substitute(style=_STYLE, heading=heading, body=_contact_html(contact)),
+    )
+
+
+def render_contact_digest(contacts: list[dict]) -> tuple[str, str, str]:
+    """(subject, text, html) for several submissions batched into one email"""
+    heading = f"📬 {len(contacts)} New Contact Form Submissions"
+    return (
+        f"Contact Form: {len(contacts)} new submissions",
+        _TEXT_PAGE.substitute(
+            heading=f"{len(contacts)} New Contact Form Submissions",
+            body="\n----------------------------\n\n".join(_contact_text(c) for c in contacts),
+        ),
+        _PAGE.substitute(style=_STYLE, heading=heading, body="".join(_contact_html(c) for c in contacts)),
+    )
@@ -0,0 +1,82 @@
+import csv
+import io
+import json
+import zlib
+from datetime import date, datetime
+from typing import AsyncIterator
+
+from app.database import ReadSessionLocal, get_read_engine
+
+# Rows fetched per round trip from the server-side cursor
+EXPORT_BATCH_SIZE = 1000
+
+MEDIA_TYPES = {
+    "csv": "text/csv; charset=utf-8",
+    "ndjson": "application/x-ndjson",
+}
+
+
+def _json_default(value):
+    if isinstance(value, (datetime, date)):
+        return value.isoformat()
+    return str(value)
+
+
+def _format_ndjson(rows) -> str:
+    return "".join(
+        json.dumps(dict(row._mapping), default=_json_default, ensure_ascii=False) + "\n"
+        for row in rows
+    )
+
+
+def _format_csv(rows) -> str:
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    writer.writerows(
+        [value.isoformat() if isinstance(value, (datetime, date)) else value for value in row]
+        for row in rows
+    )
+    return buffer.getvalue()
+
+
+async def stream_export(query, fmt: str, compress: bool = False) -> AsyncIterator[bytes]:
+    """
+    Stream the rows of a Core select as CSV or NDJSON
+
+    Rows come from a server-side cursor in batches of EXPORT_BATCH_SIZE and are
+    encoded (and optionally gzip-compressed) batch by batch, so memory stays
+    constant regardless of table size.
+
+    The generator opens its own session: FastAPI closes dependency sessions
+    before a StreamingResponse body is sent.
+    """
+    compressor = zlib.compressobj(wbits=31) if compress else None  # wbits=31 -> gzip container
+
+    def encode(text: str) -> bytes:
+        data = text.encode("utf-8")
+        return compressor.compress(data) if compressor else data
+
+    async with ReadSessionLocal() as session:
+        session.info["read_engine"] = await get_read_engine()
+        result = await session.stream(query.execution_options(yield_per=EXPORT_BATCH_SIZE))
+
+        if fmt == "csv":
+            yield encode(_format_csv([result.keys()]))
+
+        async for rows in result.partitions():
+            chunk = encode(_format_csv(rows) if fmt == "csv" else _format_ndjson(rows))
+            if chunk:
+                yield chunk
+
+    if compressor:
+        yield compressor.flush()
+
+
+def export_headers(name: str, fmt: str, compress: bool) -> dict:
+    """Content-Disposition for an export download"""
+    filename = f"{name}-{datetime.utcnow():%Y%m%d}.{fmt}" + (".gz" if compress else "")
+    return {"Content-Disposition": f'attachment; filename="{filename}"'}
+
+
+def export_media_type(fmt: str, compress: bool) -> str:
+    return "application/gzip" if compress else MEDIA_TYPES[fmt]
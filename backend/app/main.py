@@ -4,8 +4,14 @@ from contextlib import asynccontextmanager
 import os
 
 from app.config import get_settings
-from app.database import init_db
-from app.routes import contact, newsletter, health, admin, users, content
+from app.database import init_db, warm_up_pool, dispose_engines
+from app.routes import contact, newsletter, health, admin, users, content, analytics, campaigns
+from app.response_cache import ResponseCacheMiddleware
+from app.view_counter import view_counter
+from app.analytics import analytics_buffer
+from app.outbox import outbox_worker
+from app.campaigns import campaign_runner
+from app.security import password_hasher
 
 settings = get_settings()
 
@@ -27,10 +33,39 @@ async def lifespan(app: FastAPI):
         # Tables should already exist in Supabase
         print("✅ Using PostgreSQL - skipping table creation")
     
+    if settings.db_pool_warmup and not settings.use_null_pool:
+        try:
+            await warm_up_pool()
+            print("✅ Connection pool warmed up")
+        except Exception as e:
+            print(f"⚠️ Connection pool warm-up failed: {e}")
+    
+    view_counter.start()
+    analytics_buffer.start()
+    outbox_worker.start()
+    if settings.email_configured and not settings.serverless:
+        try:
+            await campaign_runner.resume_pending()
+        except Exception as e:
+            print(f"⚠️ Could not resume newsletter campaigns: {e}")
+    
     yield
     
     # Shutdown
     print("🔴 Shutting down application...")
+    await view_counter.stop()
+    await analytics_buffer.stop()
+    await outbox_worker.stop()
+    await campaign_runner.stop()
+    if settings.email_configured:
+        from app.email_service import smtp_pool
+        await smtp_pool.close()
+    password_hasher.shutdown()
+    from app.user_import import hashing_pool  # Deferred like the route; no-op unless an import ran
+    hashing_pool.shutdown()
+    from app.markdown_render import render_pool
+    render_pool.shutdown()
+    await dispose_engines()
 
 
 # Create FastAPI application
@@ -44,6 +79,9 @@ app = FastAPI(
 )
 
 
+# Cache public content responses (added before CORS so cached responses still get CORS headers)
+app.add_middleware(ResponseCacheMiddleware)
+
 # Configure CORS
 app.add_middleware(
     CORSMiddleware,
@@ -51,6 +89,7 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    expose_headers=["X-Next-Cursor", "ETag"],
 )
 
 
@@ -61,6 +100,8 @@ app.include_router(newsletter.router)
 app.include_router(admin.router)
 app.include_router(users.router)
 app.include_router(content.router)
+app.include_router(analytics.router)
+app.include_router(campaigns.router)
 
 
 @app.get("/")
@@ -0,0 +1,264 @@
+"""
+Markdown rendering for posts
+
+Post content is rendered once, when it is written: Markdown (fenced code
+highlighted by Pygments, tables, heading anchors) to HTML sanitized by nh3,
+plus a table of contents built from the headings and card metadata taken from
+the rendered prose (auto_excerpt, word_count, reading_time; code blocks are
+left out). The result is stored on the post next to
+content_hash = sha256(RENDERER_VERSION + source), so reads never render.
+Renders are also kept in a small in-process LRU under the same hash, so
+re-saving unchanged content or importing duplicate bodies doesn't render
+again. Bumping RENDERER_VERSION makes scripts/render_posts.py re-render every
+post on the next backfill.
+"""
+import asyncio
+import hashlib
+import html
+import math
+import os
+import re
+import threading
+from collections import OrderedDict
+from concurrent.futures import ProcessPoolExecutor
+from html.parser import HTMLParser
+
+from sqlalchemy import select, update, bindparam
+
+from app.config import get_settings
+from app.process_pool import SharedProcessPool, spawn_executor
+
+RENDERER_VERSION = "3"
+
+# Post columns written from a render (see Post in app/models/content.py)
+RENDERED_COLUMNS = ("content_html", "toc", "content_hash", "auto_excerpt", "word_count", "reading_time")
+
+_EXTENSIONS = ["fenced_code", "tables", "sane_lists", "codehilite", "toc"]
+_EXTENSION_CONFIGS = {
+    "codehilite": {"css_class": "highlight", "guess_lang": False},
+    "toc": {"permalink": True, "permalink_class": "heading-anchor"},
+}
+
+# nh3 defaults plus what the renderer emits: heading ids, anchor links and Pygments classes
+_ALLOWED_ATTRIBUTES = {
+    **{tag: {"id"} for tag in ("h1", "h2", "h3", "h4", "h5", "h6")},
+    "a": {"href", "hreflang", "title", "class"},
+    "div": {"class"},
+    "pre": {"class"},
+    "code": {"class"},
+    "span": {"class"},
+}
+
+# Batches with more uncached Markdown than this (characters) render on the
+# process pool; below it, shipping work to the workers (and starting them on
+# first use) costs more than it saves
+_POOL_MIN_CHARS = 500_000
+
+_WORD = re.compile(r"\w+(?:['’]\w+)*")
+
+_local = threading.local()
+_cache: OrderedDict = OrderedDict()
+
+
+def content_hash(source: str) -> str:
+    return hashlib.sha256(f"{RENDERER_VERSION}\0{source}".encode()).hexdigest()
+
+
+def _converter():
+    # Markdown instances aren't thread-safe; keep one per thread and reset() it per document
+    converter = getattr(_local, "converter", None)
+    if converter is None:
+        import markdown  # Deferred: only post writes render
+        converter = _local.converter = markdown.Markdown(
+            extensions=_EXTENSIONS, extension_configs=_EXTENSION_CONFIGS
+        )
+    return converter
+
+
+def _toc(tokens: list[dict]) -> list[dict]:
+    # The toc extension gives names HTML-escaped; store plain text
+    return [
+        {"id": t["id"], "name": html.unescape(t["name"]), "level": t["level"], "children": _toc(t["children"])}
+        for t in tokens
+    ]
+
+
+class _ProseParser(HTMLParser):
+    """Visible text of rendered HTML outside code blocks and heading anchors, and the text of each paragraph"""
+
+    def __init__(self):
+        super().__init__(convert_charrefs=True)
+        self.text: list[str] = []
+        self.paragraphs: list[str] = []
+        self._code_depth = 0
+        self._in_anchor = False
+        self._paragraph: list[str] | None = None
+
+    def handle_starttag(self, tag, attrs):
+        if tag == "pre":
+            self._code_depth += 1
+        elif tag == "a" and "heading-anchor" in (dict(attrs).get("class") or "").split():
+            self._in_anchor = True
+        elif tag == "p" and self._paragraph is None:
+            self._paragraph = []
+
+    def handle_endtag(self, tag):
+        if tag == "pre":
+            self._code_depth = max(self._code_depth - 1, 0)
+        elif tag == "a":
+            self._in_anchor = False
+        elif tag == "p" and self._paragraph is not None:
+            self.paragraphs.append(" ".join("".join(self._paragraph).split()))
+            self._paragraph = None
+
+    def handle_data(self, data):
+        if self._code_depth or self._in_anchor:
+            return
+        self.text.append(data)
+        if self._paragraph is not None:
+            self._paragraph.append(data)
+
+
+def _truncate(text: str, limit: int) -> str:
+    if len(text) <= limit:
+        return text
+    return text[:limit].rsplit(" ", 1)[0].rstrip(" ,;:.-") + "…"
+
+
+def _prose_metadata(content_html: str) -> dict:
+    """auto_excerpt, word_count and reading_time (minutes) of the rendered prose"""
+    settings = get_settings()
+    parser = _ProseParser()
+    parser.feed(content_html)
+    parser.close()
+    words = len(_WORD.findall(" ".join(parser.text)))
+    lead = " ".join(p for p in parser.paragraphs if p) or " ".join(" ".join(parser.text).split())
+    return {
+        "auto_excerpt": _truncate(lead, settings.excerpt_length) or None,
+        "word_count": words,
+        "reading_time": max(1, math.ceil(words / settings.reading_words_per_minute)) if words else 0,
+    }
+
+
+def render_markdown(source: str) -> dict:
+    """Post columns (RENDERED_COLUMNS) for a Markdown body (blocking, CPU-bound)"""
+    import nh3
+    converter = _converter()
+    converter.reset()
+    content_html = nh3.clean(
+        converter.convert(source),
+        attributes={**nh3.ALLOWED_ATTRIBUTES, **_ALLOWED_ATTRIBUTES},
+        link_rel="noopener noreferrer",
+    )
+    return {
+        "content_html": content_html,
+        "toc": _toc(converter.toc_tokens),
+        "content_hash": content_hash(source),
+        **_prose_metadata(content_html),
+    }
+
+
+def render_many(sources: list[str]) -> list[dict]:
+    """render_markdown over a chunk (one process-pool task per chunk)"""
+    return [render_markdown(source) for source in sources]
+
+
+def _remember(key: str, rendered: dict):
+    _cache[key] = rendered
+    _cache.move_to_end(key)
+    while len(_cache) > get_settings().markdown_cache_size:
+        _cache.popitem(last=False)
+
+
+def _workers() -> int:
+    return get_settings().markdown_render_processes or os.cpu_count() or 1
+
+
+# Shared by request handlers (large batches); shut down in the app lifespan
+render_pool = SharedProcessPool(lambda: get_settings().markdown_render_processes)
+
+
+def render_executor() -> ProcessPoolExecutor:
+    """A private rendering pool for one-off runs (scripts/render_posts.py)"""
+    return spawn_executor(get_settings().markdown_render_processes)
+
+
+async def _render_on_pool(executor: ProcessPoolExecutor, sources: list[str]) -> list[dict]:
+    # A few chunks per worker: fewer round trips than one task per post, still balanced
+    loop = asyncio.get_running_loop()
+    size = max(1, math.ceil(len(sources) / (_workers() * 4)))
+    chunks = [sources[i:i + size] for i in range(0, len(sources), size)]
+    results = await asyncio.gather(*(loop.run_in_executor(executor, render_many, chunk) for chunk in chunks))
+    return [rendered for chunk in results for rendered in chunk]
+
+
+async def render_post(source: str) -> dict:
+    """Rendered columns for one post body, from the cache or rendered off the event loop"""
+    key = content_hash(source)
+    rendered = _cache.get(key)
+    if rendered is None:
+        rendered = await asyncio.to_thread(render_markdown, source)
+        _remember(key, rendered)
+    return rendered
+
+
+async def render_posts(sources: list[str]) -> list[dict]:
+    """Rendered columns for many bodies; distinct uncached ones render once, on a process pool if large"""
+    keys = [content_hash(source) for source in sources]
+    missing = {key: source for key, source in zip(keys, sources) if key not in _cache}
+    if not missing:
+        rendered = []
+    elif sum(len(source) for source in missing.values()) > _POOL_MIN_CHARS:
+        rendered = await _render_on_pool(render_pool.executor, list(missing.values()))
+    else:
+        rendered = await asyncio.to_thread(render_many, list(missing.values()))
+    found = {key: _cache[key] for key in keys if key in _cache}
+    found.update(zip(missing, rendered))
+    for key, value in zip(missing, rendered):
+        _remember(key, value)
+    return [found[key] for key in keys]
+
+
+async def backfill_rendered_posts(executor: ProcessPoolExecutor, batch_size: int = 200, force: bool = False) -> int:
+    """
+    Render posts whose stored columns are missing or stale (content or renderer
+    changed), batch_size at a time in id order; returns the number updated
+    """
+    from app.database import AsyncSessionLocal
+    from app.models.content import Post
+
+    table = Post.__table__
+    statement = (
+        update(table)
+        .where(table.c.id == bindparam("_id"))
+        .values(
+            **{name: bindparam(f"_{name}", type_=table.c[name].type) for name in RENDERED_COLUMNS},
+            updated_at=table.c.updated_at,  # Not an edit
+        )
+    )
+    last_id, updated = 0, 0
+    while True:
+        async with AsyncSessionLocal() as session:
+            result = await session.execute(
+                select(table.c.id, table.c.content, table.c.content_hash)
+                .where(table.c.id > last_id)
+                .order_by(table.c.id)
+                .limit(batch_size)
+            )
+            rows = result.all()
+        if not rows:
+            return updated
+        last_id = rows[-1].id
+        stale = [row for row in rows if force or row.content_hash != content_hash(row.content)]
+        if not stale:
+            continue
+
+        # Render with no connection held (SQLite has a single writer)
+        rendered = await _render_on_pool(executor, [row.content for row in stale])
+        async with AsyncSessionLocal() as session:
+            await session.execute(statement, [
+                {"_id": row.id, **{f"_{name}": r[name] for name in RENDERED_COLUMNS}}
+                for row, r in zip(stale, rendered)
+            ])
+            await session.commit()
+            updated += len(stale)
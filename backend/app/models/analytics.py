@@ -0,0 +1,33 @@
+from sqlalchemy import Column, Integer, BigInteger, String, Date, DateTime
+from sqlalchemy.sql import func
+from app.database import Base
+
+
+class PageViewEvent(Base):
+    """Raw page views (append-only, written in batches by the analytics flusher)"""
+    __tablename__ = "page_view_events"
+
+    id = Column(BigInteger().with_variant(Integer, "sqlite"), primary_key=True)
+    path = Column(String(255), nullable=False)
+    referrer = Column(String(255), nullable=True)
+    occurred_at = Column(DateTime, nullable=False, index=True)  # UTC
+    recorded_at = Column(DateTime(timezone=True), server_default=func.now(), nullable=False)
+
+    def __repr__(self):
+        return f"<PageViewEvent {self.path} @ {self.occurred_at}>"
+
+
+class PageViewHourly(Base):
+    """Page views per UTC hour"""
+    __tablename__ = "page_views_hourly"
+
+    hour = Column(DateTime, primary_key=True)
+    views = Column(Integer, default=0, nullable=False)
+
+
+class PageViewDaily(Base):
+    """Page views per UTC day"""
+    __tablename__ = "page_views_daily"
+
+    day = Column(Date, primary_key=True)
+    views = Column(Integer, default=0, nullable=False)
@@ -0,0 +1,44 @@
+from sqlalchemy import Column, Integer, String, Text, DateTime, ForeignKey, UniqueConstraint, Index
+from sqlalchemy.sql import func
+from app.database import Base
+
+
+class Campaign(Base):
+    """Newsletter campaign; last_subscriber_id is the resume checkpoint"""
+    __tablename__ = "campaigns"
+
+    id = Column(Integer, primary_key=True, index=True)
+    subject = Column(String(255), nullable=False)
+    body_text = Column(Text, nullable=False)  # string.Template: $email, $unsubscribe_url
+    body_html = Column(Text, nullable=True)
+    status = Column(String(20), default="draft", nullable=False)  # draft, sending, paused, completed
+    last_subscriber_id = Column(Integer, default=0, nullable=False)
+    lease_expires_at = Column(DateTime, nullable=True)  # UTC; the sending worker renews it every batch
+    sent_count = Column(Integer, default=0, nullable=False)
+    failed_count = Column(Integer, default=0, nullable=False)
+    created_at = Column(DateTime(timezone=True), server_default=func.now(), nullable=False)
+    started_at = Column(DateTime(timezone=True), nullable=True)
+    completed_at = Column(DateTime(timezone=True), nullable=True)
+
+    def __repr__(self):
+        return f"<Campaign {self.id} {self.subject} {self.status}>"
+
+
+class CampaignDelivery(Base):
+    """Per-recipient delivery result for a campaign"""
+    __tablename__ = "campaign_deliveries"
+    __table_args__ = (
+        UniqueConstraint("campaign_id", "subscriber_id", name="uq_campaign_deliveries_campaign_subscriber"),
+        Index("ix_campaign_deliveries_campaign_status", "campaign_id", "status", "subscriber_id"),
+    )
+
+    id = Column(Integer, primary_key=True)
+    campaign_id = Column(Integer, ForeignKey("campaigns.id", ondelete="CASCADE"), nullable=False)
+    subscriber_id = Column(Integer, nullable=False)
+    email = Column(String(255), nullable=False)
+    status = Column(String(20), nullable=False)  # sent, failed
+    error = Column(Text, nullable=True)
+    attempted_at = Column(DateTime(timezone=True), server_default=func.now(), nullable=False)
+
+    def __repr__(self):
+        return f"<CampaignDelivery {self.campaign_id}:{self.subscriber_id} {self.status}>"
@@ -1,4 +1,4 @@
-from sqlalchemy import Column, Integer, String, Text, DateTime
+from sqlalchemy import Column, Integer, String, Text, DateTime, Index
 from sqlalchemy.sql import func
 from app.database import Base
 
@@ -6,6 +6,9 @@ from app.database import Base
 class Contact(Base):
     """Contact form submissions"""
     __tablename__ = "contacts"
+    __table_args__ = (
+        Index("ix_contacts_created_at_id", "created_at", "id"),  # Keyset pagination
+    )
     
     id = Column(Integer, primary_key=True, index=True)
     name = Column(String(100), nullable=False)
@@ -22,6 +25,9 @@ class Contact(Base):
 class Newsletter(Base):
     """Newsletter subscriptions"""
     __tablename__ = "newsletters"
+    __table_args__ = (
+        Index("ix_newsletters_subscribed_at_id", "subscribed_at", "id"),  # Keyset pagination
+    )
     
     id = Column(Integer, primary_key=True, index=True)
     email = Column(String(255), unique=True, nullable=False, index=True)
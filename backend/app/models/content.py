@@ -1,4 +1,4 @@
-from sqlalchemy import Column, Integer, String, Text, DateTime, ForeignKey, Boolean
+from sqlalchemy import Column, Integer, String, Text, DateTime, ForeignKey, Boolean, Index, JSON
 from sqlalchemy.orm import relationship
 from sqlalchemy.sql import func
 from app.database import Base
@@ -17,6 +17,9 @@ class Category(Base):
 
 class Post(Base):
     __tablename__ = "posts"
+    __table_args__ = (
+        Index("ix_posts_created_at_id", "created_at", "id"),  # Keyset pagination
+    )
 
     id = Column(Integer, primary_key=True, index=True)
     title = Column(String(255), nullable=False)
@@ -26,9 +29,19 @@ class Post(Base):
     status = Column(String(20), default="draft", nullable=False)  # draft, published
     views = Column(Integer, default=0)
     image_url = Column(String(255), nullable=True)
+
+    # Rendered from content on write (app/markdown_render.py); reads never render
+    content_html = Column(Text, nullable=True)
+    toc = Column(JSON, nullable=True)
+    content_hash = Column(String(64), nullable=True)  # sha256 of renderer version + content
+    # Card metadata, so list views never read the body
+    auto_excerpt = Column(Text, nullable=True)  # Opening of the prose (cards use excerpt first)
+    word_count = Column(Integer, nullable=True)
+    reading_time = Column(Integer, nullable=True)  # Minutes
     
     category_id = Column(Integer, ForeignKey("categories.id"), nullable=True)
-    category = relationship("Category", back_populates="posts")
+    # Joined eager load: posts are always serialized with their category, so fetch it in the same query
+    category = relationship("Category", back_populates="posts", lazy="joined")
     
     created_at = Column(DateTime(timezone=True), server_default=func.now(), nullable=False)
     updated_at = Column(DateTime(timezone=True), onupdate=func.now(), nullable=True)
@@ -38,6 +51,9 @@ class Post(Base):
 
 class Project(Base):
     __tablename__ = "projects"
+    __table_args__ = (
+        Index("ix_projects_created_at_id", "created_at", "id"),  # Keyset pagination
+    )
 
     id = Column(Integer, primary_key=True, index=True)
     title = Column(String(255), nullable=False)
@@ -0,0 +1,223 @@
+"""
+Transactional email outbox
+
+Routes call enqueue() inside the transaction that creates the triggering row,
+so a committed contact always has its notification queued and a rolled-back
+one never does. OutboxWorker (started in lifespan) delivers queued mail in
+the background:
+
+- messages are claimed with a single conditional UPDATE ... RETURNING that
+  pushes next_attempt_at out by a lease, so concurrent workers never send the
+  same message twice and a crashed worker's claims come back after the lease
+- failures are retried with exponential backoff (plus jitter)
+- after outbox_max_attempts the message is marked dead and kept for inspection
+
+In digest mode (email_digest_window > 0) contact notifications are queued
+for the end of the current window, so a burst of submissions becomes due at
+once and goes out as a single digest email.
+"""
+import asyncio
+import json
+import logging
+import random
+from datetime import datetime, timedelta
+from functools import partial
+
+from sqlalchemy import select, update, func
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.config import get_settings
+from app.database import AsyncSessionLocal
+from app.models.outbox import EmailOutbox
+
+logger = logging.getLogger(__name__)
+
+_outbox = EmailOutbox.__table__
+
+
+def enqueue(db: AsyncSession, kind: str, payload: dict, send_after: datetime | None = None) -> EmailOutbox:
+    """Queue an email in the caller's transaction (committed with it)"""
+    message = EmailOutbox(
+        kind=kind,
+        payload=json.dumps(payload, ensure_ascii=False),
+        status="pending",
+        attempts=0,
+        next_attempt_at=send_after or datetime.utcnow(),
+    )
+    db.add(message)
+    return message
+
+
+async def _deliver_contact(payload: dict):
+    # Imported here so the SMTP client isn't loaded on cold start
+    from app.email_service import deliver_contact_email
+    await deliver_contact_email(**payload)
+
+
+async def _deliver_contact_digest(payloads: list[dict]):
+    from app.email_service import deliver_contact_digest
+    await deliver_contact_digest(payloads)
+
+
+SENDERS = {
+    "contact": _deliver_contact,
+}
+
+# Kinds that can be batched into one email in digest mode
+DIGEST_SENDERS = {
+    "contact": _deliver_contact_digest,
+}
+
+
+def digest_release_time(now: datetime | None = None) -> datetime:
+    """End of the current email_digest_window; everything queued until then is sent together"""
+    window = get_settings().email_digest_window
+    now = now or datetime.utcnow()
+    epoch_seconds = (now - datetime(1970, 1, 1)).total_seconds()
+    return datetime(1970, 1, 1) + timedelta(seconds=(epoch_seconds // window + 1) * window)
+
+
+def retry_delay(attempts: int) -> float:
+    """Seconds to wait after the given number of failed attempts"""
+    settings = get_settings()
+    delay = min(settings.outbox_backoff_base * 2 ** (attempts - 1), settings.outbox_backoff_max)
+    return delay * random.uniform(0.8, 1.2)
+
+
+class OutboxWorker:
+    def __init__(self):
+        self._wake = asyncio.Event()
+        self._task: asyncio.Task | None = None
+        self._stopping = False
+        self._drain_lock = asyncio.Lock()
+        self.sent = 0
+        self.failed = 0
+        self.dead = 0
+
+    def notify(self):
+        """Wake the worker after committing new outbox rows"""
+        self._wake.set()
+
+    async def _claim(self) -> list:
+        settings = get_settings()
+        now = datetime.utcnow()
+        due = (
+            select(_outbox.c.id)
+            .where(_outbox.c.status == "pending", _outbox.c.next_attempt_at <= now)
+            .order_by(_outbox.c.next_attempt_at)
+            .limit(settings.outbox_batch_size)
+        )
+        statement = (
+            update(_outbox)
+            .where(
+                _outbox.c.id.in_(due.scalar_subquery()),
+                _outbox.c.status == "pending",
+                _outbox.c.next_attempt_at <= now,
+            )
+            .values(
+                next_attempt_at=now + timedelta(seconds=settings.outbox_lease_seconds),
+                attempts=_outbox.c.attempts + 1,
+            )
+            .returning(_outbox.c.id, _outbox.c.kind, _outbox.c.payload, _outbox.c.attempts)
+        )
+        async with AsyncSessionLocal() as session:
+            rows = (await session.execute(statement)).all()
+            await session.commit()
+        return rows
+
+    async def _finish(self, message_ids: list[int], **values):
+        async with AsyncSessionLocal() as session:
+            await session.execute(update(_outbox).where(_outbox.c.id.in_(message_ids)).values(**values))
+            await session.commit()
+
+    async def _fail(self, row, error: str, permanent: bool = False):
+        if permanent or row.attempts >= get_settings().outbox_max_attempts:
+            self.dead += 1
+            logger.error(f"Outbox message {row.id} dead-lettered after {row.attempts} attempts: {error}")
+            await self._finish([row.id], status="dead", last_error=error)
+        else:
+            self.failed += 1
+            delay = retry_delay(row.attempts)
+            logger.warning(f"Outbox message {row.id} failed (attempt {row.attempts}), retrying in {delay:.0f}s: {error}")
+            await self._finish(
+                [row.id],
+                next_attempt_at=datetime.utcnow() + timedelta(seconds=delay),
+                last_error=error,
+            )
+
+    async def _deliver(self, rows: list, send):
+        """Run send() for rows (one message, or several batched into a digest)"""
+        try:
+            await send()
+        except Exception as e:
+            error = f"{type(e).__name__}: {e}"
+            for row in rows:
+                await self._fail(row, error)
+            return
+
+        self.sent += len(rows)
+        await self._finish([row.id for row in rows], status="sent", sent_at=func.now(), last_error=None)
+
+    def _deliveries(self, rows: list) -> list:
+        deliveries = []
+        if get_settings().email_digest_window:
+            for kind, send_digest in DIGEST_SENDERS.items():
+                batch = [row for row in rows if row.kind == kind]
+                if len(batch) > 1:
+                    payloads = [json.loads(row.payload) for row in batch]
+                    deliveries.append(self._deliver(batch, partial(send_digest, payloads)))
+                    rows = [row for row in rows if row.kind != kind]
+
+        for row in rows:
+            sender = SENDERS.get(row.kind)
+            if sender is None:
+                deliveries.append(self._fail(row, f"No sender for outbox kind '{row.kind}'", permanent=True))
+            else:
+                deliveries.append(self._deliver([row], partial(sender, json.loads(row.payload))))
+        return deliveries
+
+    async def drain(self) -> int:
+        """Deliver every message that is due; returns the number processed"""
+        processed = 0
+        async with self._drain_lock:
+            while not self._stopping:
+                rows = await self._claim()
+                if not rows:
+                    return processed
+                # Concurrency is capped by the SMTP connection pool
+                await asyncio.gather(*self._deliveries(rows))
+                processed += len(rows)
+        return processed
+
+    async def _run(self):
+        interval = get_settings().outbox_poll_interval
+        while not self._stopping:
+            try:
+                await self.drain()
+            except Exception as e:
+                logger.error(f"Outbox drain failed: {e}")
+            try:
+                await asyncio.wait_for(self._wake.wait(), timeout=interval)
+            except asyncio.TimeoutError:
+                pass
+            self._wake.clear()
+
+    def start(self):
+        if self._task is None:
+            self._stopping = False
+            self._wake = asyncio.Event()  # Bound to the running loop
+            self._task = asyncio.create_task(self._run())
+
+    async def stop(self):
+        """Stop after the current delivery; unsent mail stays queued for the next start"""
+        if self._task is not None:
+            self._stopping = True
+            self._wake.set()
+            await self._task
+            self._task = None
+
+    def stats(self) -> dict:
+        return {"sent": self.sent, "failed": self.failed, "dead": self.dead}
+
+
+outbox_worker = OutboxWorker()
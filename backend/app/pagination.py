@@ -0,0 +1,87 @@
+"""Keyset (cursor) pagination for list endpoints"""
+import base64
+import json
+from datetime import datetime
+
+from fastapi import HTTPException, Response, status
+from sqlalchemy import tuple_, literal, String
+from sqlalchemy.ext.asyncio import AsyncSession
+
+NEXT_CURSOR_HEADER = "X-Next-Cursor"
+
+
+def encode_cursor(sort_value: datetime, row_id: int) -> str:
+    """Opaque cursor pointing just after (sort_value, row_id)"""
+    raw = json.dumps([sort_value.isoformat(), row_id], separators=(",", ":"))
+    return base64.urlsafe_b64encode(raw.encode()).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str) -> tuple[datetime, int]:
+    """Parse a cursor produced by encode_cursor"""
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        sort_value, row_id = json.loads(base64.urlsafe_b64decode(padded))
+        return datetime.fromisoformat(sort_value), int(row_id)
+    except (ValueError, TypeError):
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Invalid pagination cursor"
+        )
+
+
+def _bind_sort_value(value: datetime, dialect_name: str):
+    if dialect_name == "sqlite":
+        # SQLite stores server_default timestamps as text without microseconds;
+        # compare against the same text form so equal timestamps sort together
+        text_value = value.strftime("%Y-%m-%d %H:%M:%S")
+        if value.microsecond:
+            text_value += f".{value.microsecond:06d}"
+        return literal(text_value, String)
+    return value
+
+
+async def fetch_page(
+    db: AsyncSession,
+    query,
+    sort_column,
+    id_column,
+    response: Response,
+    cursor: str | None = None,
+    skip: int = 0,
+    limit: int = 100,
+    descending: bool = True,
+):
+    """
+    Run a list query keyed on (sort_column, id_column), newest first unless
+    descending is False
+
+    With a cursor the query seeks straight to the next page; without one it
+    falls back to offset paging via skip. Either way the cursor for the
+    following page is returned in the X-Next-Cursor header. Offset and cursor
+    pages share one order, so endpoints keep the order they had before
+    cursors existed.
+    """
+    if descending:
+        query = query.order_by(sort_column.desc(), id_column.desc())
+    else:
+        query = query.order_by(sort_column.asc(), id_column.asc())
+    if cursor:
+        sort_value, row_id = decode_cursor(cursor)
+        dialect_name = db.get_bind().dialect.name
+        key = tuple_(sort_column, id_column)
+        after = tuple_(_bind_sort_value(sort_value, dialect_name), row_id)
+        query = query.where(key < after if descending else key > after)
+    elif skip:
+        query = query.offset(skip)
+
+    # Fetch one extra row to know whether another page exists
+    result = await db.execute(query.limit(limit + 1))
+    rows = result.scalars().all()
+    page = rows[:limit]
+
+    if len(rows) > limit and page:
+        last = page[-1]
+        response.headers[NEXT_CURSOR_HEADER] = encode_cursor(
+            getattr(last, sort_column.key), getattr(last, id_column.key)
+        )
+    return page
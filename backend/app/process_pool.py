@@ -0,0 +1,33 @@
+"""
+Long-lived process pools for CPU-bound bulk work in request handlers
+
+Spawning a pool costs a fresh interpreter per worker, so HTTP handlers share
+one pool per kind of work, started on first use and shut down in the app
+lifespan (scripts build their own per run). The spawn start method keeps
+workers safe to create from a threaded server.
+"""
+import multiprocessing
+import os
+from concurrent.futures import ProcessPoolExecutor
+from typing import Callable
+
+
+def spawn_executor(workers: int) -> ProcessPoolExecutor:
+    return ProcessPoolExecutor(max_workers=workers or os.cpu_count() or 1, mp_context=multiprocessing.get_context("spawn"))
+
+
+class SharedProcessPool:
+    def __init__(self, workers: Callable[[], int]):
+        self._workers = workers  # Read on first use, so settings can change before then
+        self._executor: ProcessPoolExecutor | None = None
+
+    @property
+    def executor(self) -> ProcessPoolExecutor:
+        if self._executor is None:
+            self._executor = spawn_executor(self._workers())
+        return self._executor
+
+    def shutdown(self):
+        if self._executor is not None:
+            self._executor.shutdown(wait=False, cancel_futures=True)
+            self._executor = None
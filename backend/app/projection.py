@@ -0,0 +1,53 @@
+"""Summary views and sparse fieldsets (?fields=) for list endpoints"""
+from typing import Iterable, Type
+
+from fastapi import HTTPException, Response, status
+from pydantic import BaseModel, TypeAdapter
+from sqlalchemy.orm import load_only
+
+from app.pagination import NEXT_CURSOR_HEADER
+
+_list_adapters: dict = {}
+
+
+def parse_fields(fields: str | None, allowed: Iterable[str]) -> list[str] | None:
+    """Split a comma-separated ?fields= value, rejecting unknown names"""
+    if not fields:
+        return None
+    names = [name.strip() for name in fields.split(",") if name.strip()]
+    unknown = sorted(set(names) - set(allowed))
+    if unknown:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"Unknown fields: {', '.join(unknown)}"
+        )
+    return list(dict.fromkeys(["id", *names]))
+
+
+def load_columns(model, names: Iterable[str], always: Iterable[str] = ("id", "created_at")):
+    """load_only() option selecting the given column names (unknown or relationship names are skipped)"""
+    columns = model.__table__.c
+    wanted = dict.fromkeys([*always, *names])
+    return load_only(*(getattr(model, name) for name in wanted if name in columns))
+
+
+def project(rows, response: Response, schema: Type[BaseModel] = None, fields: list[str] = None) -> Response:
+    """
+    Serialize rows straight to JSON with a summary schema or a sparse fieldset
+
+    Returning a Response skips the route's full response_model, so deferred
+    body columns are never touched; the pagination cursor header is carried over.
+    """
+    if fields:
+        data = [{name: getattr(row, name) for name in fields} for row in rows]
+        body = TypeAdapter(list[dict]).dump_json(data)
+    else:
+        adapter = _list_adapters.get(schema)
+        if adapter is None:
+            adapter = _list_adapters[schema] = TypeAdapter(list[schema])
+        body = adapter.dump_json(adapter.validate_python(rows, from_attributes=True))
+
+    headers = {}
+    if NEXT_CURSOR_HEADER in response.headers:
+        headers[NEXT_CURSOR_HEADER] = response.headers[NEXT_CURSOR_HEADER]
+    return Response(content=body, media_type="application/json", headers=headers)
@@ -0,0 +1,160 @@
+"""
+HTTP response cache for the public content API
+
+Rendered GET responses under /api/content/ are kept in memory together with
+the version counters of the resources they were built from. Write handlers
+bump those counters, which invalidates every dependent entry at once. Cached
+entries carry a strong ETag (hash of the body), so a matching If-None-Match
+is answered with 304 Not Modified without touching the database.
+"""
+import hashlib
+import time
+from collections import OrderedDict
+
+from app.config import get_settings
+
+CONTENT_PREFIX = "/api/content/"
+
+# Resource (first path segment under /api/content/) -> versions its responses depend on
+RESOURCE_DEPENDENCIES = {
+    "categories": ("categories",),
+    "posts": ("posts", "categories"),  # Posts embed their category
+    "projects": ("projects",),
+    "search": ("posts", "projects"),
+}
+
+# Response headers kept with a cached entry
+_STORED_HEADERS = (b"content-type", b"x-next-cursor")
+
+
+class CacheEntry:
+    __slots__ = ("versions", "stored_at", "body", "headers", "etag")
+
+    def __init__(self, versions, body: bytes, headers: list, etag: bytes):
+        self.versions = versions
+        self.stored_at = time.monotonic()
+        self.body = body
+        self.headers = headers
+        self.etag = etag
+
+
+class ResponseCache:
+    """Per-resource version counters plus an LRU of rendered responses"""
+
+    def __init__(self, max_entries: int = 1000):
+        self.max_entries = max_entries
+        self.versions: dict[str, int] = {}
+        self.entries: OrderedDict = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+        self.not_modified = 0
+
+    def bump(self, resource: str):
+        """Invalidate every cached response that depends on resource"""
+        self.versions[resource] = self.versions.get(resource, 0) + 1
+
+    def snapshot(self, resource: str) -> tuple:
+        return tuple(self.versions.get(dep, 0) for dep in RESOURCE_DEPENDENCIES[resource])
+
+    def get(self, key: str, versions: tuple) -> CacheEntry | None:
+        entry = self.entries.get(key)
+        if entry is None:
+            return None
+        if entry.versions != versions or time.monotonic() - entry.stored_at > get_settings().content_cache_ttl:
+            del self.entries[key]
+            return None
+        self.entries.move_to_end(key)
+        return entry
+
+    def put(self, key: str, entry: CacheEntry):
+        self.entries[key] = entry
+        self.entries.move_to_end(key)
+        while len(self.entries) > self.max_entries:
+            self.entries.popitem(last=False)
+
+    def stats(self) -> dict:
+        lookups = self.hits + self.misses
+        return {
+            "entries": len(self.entries),
+            "hits": self.hits,
+            "misses": self.misses,
+            "not_modified": self.not_modified,
+            "hit_ratio": round(self.hits / lookups, 4) if lookups else 0.0,
+            "versions": dict(self.versions),
+        }
+
+
+response_cache = ResponseCache()
+
+
+def _etag_matches(if_none_match: bytes | None, etag: bytes) -> bool:
+    if not if_none_match:
+        return False
+    candidates = [tag.strip() for tag in if_none_match.split(b",")]
+    return b"*" in candidates or etag in candidates
+
+
+class ResponseCacheMiddleware:
+    """ASGI middleware serving /api/content/ GETs from response_cache"""
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http" or scope["method"] != "GET" or not scope["path"].startswith(CONTENT_PREFIX):
+            return await self.app(scope, receive, send)
+
+        resource = scope["path"][len(CONTENT_PREFIX):].split("/", 1)[0]
+        if resource not in RESOURCE_DEPENDENCIES:
+            return await self.app(scope, receive, send)
+
+        key = scope["path"] + "?" + scope["query_string"].decode("latin-1")
+        versions = response_cache.snapshot(resource)
+        if_none_match = dict(scope["headers"]).get(b"if-none-match")
+        cache_control = get_settings().content_cache_control.encode()
+
+        entry = response_cache.get(key, versions)
+        if entry is not None:
+            response_cache.hits += 1
+            await self._send_entry(send, entry, cache_control, if_none_match)
+            return
+
+        response_cache.misses += 1
+        start_message = {}
+        body_parts = []
+
+        async def capture(message):
+            if message["type"] == "http.response.start":
+                start_message.update(message)
+            elif message["type"] == "http.response.body":
+                body_parts.append(message.get("body", b""))
+
+        await self.app(scope, receive, capture)
+
+        body = b"".join(body_parts)
+        if start_message.get("status") != 200:
+            # Errors aren't cached; replay them unchanged
+            await send(start_message)
+            await send({"type": "http.response.body", "body": body})
+            return
+
+        etag = b'"' + hashlib.sha256(body).hexdigest()[:32].encode() + b'"'
+        headers = [(name, value) for name, value in start_message.get("headers", []) if name in _STORED_HEADERS]
+        entry = CacheEntry(versions, body, headers, etag)
+        # Stored under the versions seen before the handler ran: a concurrent
+        # write bumps the counters, so this entry is already stale and never served
+        response_cache.put(key, entry)
+        await self._send_entry(send, entry, cache_control, if_none_match)
+
+    async def _send_entry(self, send, entry: CacheEntry, cache_control: bytes, if_none_match):
+        headers = [(b"etag", entry.etag), (b"cache-control", cache_control)]
+        if _etag_matches(if_none_match, entry.etag):
+            response_cache.not_modified += 1
+            await send({"type": "http.response.start", "status": 304, "headers": headers})
+            await send({"type": "http.response.body", "body": b""})
+            return
+
+        headers += entry.headers
+        headers.append((b"content-length", str(len(entry.body)).encode()))
+        await send({"type": "http.response.start", "status": 200, "headers": headers})
+        await send({"type": "http.response.body", "body": entry.body})
@@ -1,13 +1,19 @@
-from fastapi import APIRouter, HTTPException, Depends, status
+from fastapi import APIRouter, HTTPException, Depends, Query, Response, status
+from fastapi.responses import StreamingResponse
 from pydantic import BaseModel
-from typing import List
-from datetime import datetime, timedelta
+from typing import List, Literal
+from datetime import date, datetime, timedelta
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy import select, delete
 
-from app.database import get_db
-from app.models.contact import Contact
-from app.schemas import ContactResponse
+from app.database import get_db, get_read_db
+from app.models.contact import Contact, Newsletter
+from app.models.outbox import EmailOutbox
+from app.schemas import ContactResponse, OutboxMessageResponse
+from app.pagination import fetch_page
+from app.export_service import stream_export, export_headers, export_media_type
+from app.analytics import daily_views, hourly_views
+from app.outbox import outbox_worker
 import os
 
 router = APIRouter(prefix="/api/admin", tags=["admin"])
@@ -22,18 +28,12 @@ class LoginResponse(BaseModel):
 
 class StatsResponse(BaseModel):
     day: str
+    date: date
     views: int
 
-# Simple in-memory stats for demo purposes
-FAKE_STATS = [
-    {"day": "Mon", "views": 120},
-    {"day": "Tue", "views": 150},
-    {"day": "Wed", "views": 180},
-    {"day": "Thu", "views": 190},
-    {"day": "Fri", "views": 250},
-    {"day": "Sat", "views": 300},
-    {"day": "Sun", "views": 280},
-]
+class HourlyStatsResponse(BaseModel):
+    hour: datetime
+    views: int
 
 @router.post("/login", response_model=LoginResponse)
 async def login(credentials: LoginRequest):
@@ -49,36 +49,114 @@ async def login(credentials: LoginRequest):
     )
 
 @router.get("/stats", response_model=List[StatsResponse])
-async def get_stats():
-    return FAKE_STATS
+async def get_stats(days: int = Query(7, ge=1, le=90), db: AsyncSession = Depends(get_read_db)):
+    """Page views per UTC day, oldest first (read from the daily rollup)"""
+    return [
+        {"day": day.strftime("%a"), "date": day, "views": views}
+        for day, views in await daily_views(db, days)
+    ]
+
+@router.get("/stats/hourly", response_model=List[HourlyStatsResponse])
+async def get_hourly_stats(hours: int = Query(24, ge=1, le=168), db: AsyncSession = Depends(get_read_db)):
+    """Page views per UTC hour, oldest first (read from the hourly rollup)"""
+    return [{"hour": hour, "views": views} for hour, views in await hourly_views(db, hours)]
 
 @router.get("/contacts", response_model=List[ContactResponse])
 async def get_contacts(
+    response: Response,
+    cursor: str | None = None,
     skip: int = 0,
     limit: int = 100,
-    db: AsyncSession = Depends(get_db)
+    db: AsyncSession = Depends(get_read_db)
 ):
-    result = await db.execute(
-        select(Contact).offset(skip).limit(limit).order_by(Contact.created_at.desc())
+    return await fetch_page(
+        db, select(Contact), Contact.created_at, Contact.id,
+        response, cursor=cursor, skip=skip, limit=limit
     )
-    contacts = result.scalars().all()
-    return contacts
 
 @router.delete("/contacts/{contact_id}")
 async def delete_contact(
     contact_id: int,
     db: AsyncSession = Depends(get_db)
 ):
-    result = await db.execute(select(Contact).where(Contact.id == contact_id))
-    contact = result.scalar_one_or_none()
-    
-    if not contact:
+    result = await db.execute(
+        delete(Contact)
+        .where(Contact.id == contact_id)
+        .returning(Contact.id)
+        .execution_options(synchronize_session=False)
+    )
+    if result.first() is None:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail=f"Contact with id {contact_id} not found"
         )
-    
-    await db.delete(contact)
     await db.commit()
     
     return {"message": "Contact deleted successfully"}
+
+
+@router.get("/export/contacts")
+async def export_contacts(format: Literal["ndjson", "csv"] = "ndjson", gzip: bool = False):
+    """Stream every contact submission as NDJSON or CSV (optionally gzip-compressed)"""
+    query = select(*Contact.__table__.c).order_by(Contact.id)
+    return StreamingResponse(
+        stream_export(query, format, gzip),
+        media_type=export_media_type(format, gzip),
+        headers=export_headers("contacts", format, gzip),
+    )
+
+@router.get("/export/subscribers")
+async def export_subscribers(
+    format: Literal["ndjson", "csv"] = "ndjson",
+    gzip: bool = False,
+    active_only: bool = True
+):
+    """Stream newsletter subscribers as NDJSON or CSV (optionally gzip-compressed)"""
+    query = select(*Newsletter.__table__.c).order_by(Newsletter.id)
+    if active_only:
+        query = query.where(Newsletter.is_active == 1)
+    return StreamingResponse(
+        stream_export(query, format, gzip),
+        media_type=export_media_type(format, gzip),
+        headers=export_headers("subscribers", format, gzip),
+    )
+
+
+@router.get("/outbox", response_model=List[OutboxMessageResponse])
+async def get_outbox(
+    status_filter: Literal["pending", "sent", "dead"] = Query("dead", alias="status"),
+    limit: int = Query(100, ge=1, le=500),
+    db: AsyncSession = Depends(get_read_db)
+):
+    """Queued emails by status (dead = gave up after outbox_max_attempts)"""
+    result = await db.execute(
+        select(EmailOutbox)
+        .where(EmailOutbox.status == status_filter)
+        .order_by(EmailOutbox.id.desc())
+        .limit(limit)
+    )
+    return result.scalars().all()
+
+@router.post("/outbox/{message_id}/retry", response_model=OutboxMessageResponse)
+async def retry_outbox_message(message_id: int, db: AsyncSession = Depends(get_db)):
+    """Put a dead-lettered email back in the queue"""
+    result = await db.execute(select(EmailOutbox).where(EmailOutbox.id == message_id))
+    message = result.scalar_one_or_none()
+    if not message:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail=f"Outbox message with id {message_id} not found"
+        )
+    if message.status != "dead":
+        raise HTTPException(
+            status_code=status.HTTP_409_CONFLICT,
+            detail=f"Outbox message {message_id} is {message.status}, not dead"
+        )
+    
+    message.status = "pending"
+    message.attempts = 0
+    message.next_attempt_at = datetime.utcnow()
+    await db.commit()
+    await db.refresh(message)
+    outbox_worker.notify()
+    return message
@@ -0,0 +1,23 @@
+from fastapi import APIRouter, BackgroundTasks, status
+from app.schemas import PageViewCreate
+from app.analytics import analytics_buffer
+from app.config import get_settings
+
+router = APIRouter(prefix="/api/analytics", tags=["analytics"])
+
+
+@router.post("/events", status_code=status.HTTP_202_ACCEPTED)
+async def record_page_view(event: PageViewCreate, background_tasks: BackgroundTasks):
+    """
+    Record a page view
+    
+    - **path**: Page path, e.g. /blog/hello-world
+    - **referrer**: Optional referring URL
+    
+    Events are buffered in memory and written in batches; on serverless there
+    is no background flusher, so flush after responding.
+    """
+    analytics_buffer.record(event.path, event.referrer)
+    if get_settings().serverless:
+        background_tasks.add_task(analytics_buffer.flush)
+    return {"status": "accepted"}
@@ -0,0 +1,114 @@
+from fastapi import APIRouter, Depends, HTTPException, Query, status
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy import select, update
+from typing import List, Literal
+
+from app.database import get_db, get_read_db
+from app.models.campaign import Campaign, CampaignDelivery
+from app.schemas import CampaignCreate, CampaignResponse, CampaignDeliveryResponse
+from app.campaigns import campaign_runner
+from app.config import get_settings
+
+router = APIRouter(prefix="/api/admin/campaigns", tags=["admin"])
+
+
+async def _get_campaign(db: AsyncSession, campaign_id: int) -> Campaign:
+    campaign = await db.get(Campaign, campaign_id)
+    if not campaign:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail=f"Campaign with id {campaign_id} not found"
+        )
+    return campaign
+
+
+@router.post("/", response_model=CampaignResponse, status_code=status.HTTP_201_CREATED)
+async def create_campaign(campaign_data: CampaignCreate, db: AsyncSession = Depends(get_db)):
+    """Create a draft campaign"""
+    campaign = Campaign(**campaign_data.model_dump(), status="draft", last_subscriber_id=0, sent_count=0, failed_count=0)
+    db.add(campaign)
+    await db.commit()
+    await db.refresh(campaign)
+    return campaign
+
+
+@router.get("/", response_model=List[CampaignResponse])
+async def get_campaigns(limit: int = Query(50, ge=1, le=200), db: AsyncSession = Depends(get_read_db)):
+    result = await db.execute(select(Campaign).order_by(Campaign.id.desc()).limit(limit))
+    return result.scalars().all()
+
+
+@router.get("/{campaign_id}", response_model=CampaignResponse)
+async def get_campaign(campaign_id: int, db: AsyncSession = Depends(get_db)):
+    """Campaign status and progress (read from the primary so counters are current)"""
+    return await _get_campaign(db, campaign_id)
+
+
+@router.post("/{campaign_id}/send", response_model=CampaignResponse, status_code=status.HTTP_202_ACCEPTED)
+async def send_campaign(campaign_id: int, db: AsyncSession = Depends(get_db)):
+    """
+    Start (or resume) sending to every active subscriber
+    
+    Progress is checkpointed per batch; poll GET /{campaign_id} for counts.
+    """
+    settings = get_settings()
+    if not settings.email_configured:
+        raise HTTPException(status_code=status.HTTP_503_SERVICE_UNAVAILABLE, detail="Email is not configured")
+    if settings.serverless:
+        raise HTTPException(
+            status_code=status.HTTP_501_NOT_IMPLEMENTED,
+            detail="Campaigns need a long-running server"
+        )
+    
+    # Claim before this request's session opens a connection: on SQLite both
+    # would need the single writer connection
+    started = await campaign_runner.start(campaign_id)
+    campaign = await _get_campaign(db, campaign_id)
+    if not started:
+        raise HTTPException(
+            status_code=status.HTTP_409_CONFLICT,
+            detail=f"Campaign {campaign_id} is {campaign.status} and can't be started"
+        )
+    return campaign
+
+
+@router.post("/{campaign_id}/pause", response_model=CampaignResponse)
+async def pause_campaign(campaign_id: int, db: AsyncSession = Depends(get_db)):
+    """Stop after the current batch; /send resumes from the checkpoint"""
+    campaign = await _get_campaign(db, campaign_id)
+    if campaign.status != "sending":
+        raise HTTPException(
+            status_code=status.HTTP_409_CONFLICT,
+            detail=f"Campaign {campaign_id} is {campaign.status}, not sending"
+        )
+    await db.execute(
+        update(Campaign)
+        .where(Campaign.id == campaign_id, Campaign.status == "sending")
+        .values(status="paused", lease_expires_at=None)
+        .execution_options(synchronize_session=False)
+    )
+    await db.commit()
+    await db.refresh(campaign)
+    return campaign
+
+
+@router.get("/{campaign_id}/deliveries", response_model=List[CampaignDeliveryResponse])
+async def get_campaign_deliveries(
+    campaign_id: int,
+    status_filter: Literal["sent", "failed"] = Query("failed", alias="status"),
+    after: int = Query(0, ge=0, description="Subscriber id to continue after"),
+    limit: int = Query(100, ge=1, le=1000),
+    db: AsyncSession = Depends(get_read_db)
+):
+    """Per-recipient results, in subscriber id order"""
+    result = await db.execute(
+        select(CampaignDelivery)
+        .where(
+            CampaignDelivery.campaign_id == campaign_id,
+            CampaignDelivery.status == status_filter,
+            CampaignDelivery.subscriber_id > after,
+        )
+        .order_by(CampaignDelivery.subscriber_id)
+        .limit(limit)
+    )
+    return result.scalars().all()
@@ -1,10 +1,12 @@
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import APIRouter, BackgroundTasks, Depends, HTTPException, Response, status
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy import select
-from app.database import get_db
+from app.database import get_db, get_read_db
 from app.models.contact import Contact
 from app.schemas import ContactCreate, ContactResponse
-from app.email_service import send_contact_email
+from app.pagination import fetch_page
+from app.outbox import enqueue, outbox_worker, digest_release_time
+from app.config import get_settings
 import logging
 
 logger = logging.getLogger(__name__)
@@ -15,6 +17,7 @@ router = APIRouter(prefix="/api/contact", tags=["contact"])
 @router.post("/", response_model=ContactResponse, status_code=status.HTTP_201_CREATED)
 async def create_contact(
     contact_data: ContactCreate,
+    background_tasks: BackgroundTasks,
     db: AsyncSession = Depends(get_db)
 ):
     """
@@ -35,50 +38,57 @@ async def create_contact(
     )
     
     db.add(contact)
+    
+    # Queue the email notification in the same transaction; the outbox worker
+    # sends it (with retries) after the response
+    settings = get_settings()
+    if settings.email_configured:
+        enqueue(db, "contact", {
+            "name": contact_data.name,
+            "email": contact_data.email,
+            "subject": contact_data.subject,
+            "message": contact_data.message,
+        }, send_after=digest_release_time() if settings.email_digest_window else None)
+    else:
+        logger.warning(f"Email not configured; no notification for submission from {contact_data.email}")
+    
     await db.commit()
     await db.refresh(contact)
     
-    # Send email notification (don't fail if email fails)
-    try:
-        email_sent = await send_contact_email(
-            name=contact_data.name,
-            email=contact_data.email,
-            subject=contact_data.subject,
-            message=contact_data.message
-        )
-        if email_sent:
-            logger.info(f"Contact form email sent for submission from {contact_data.email}")
-        else:
-            logger.warning(f"Email not sent for contact form submission from {contact_data.email}")
-    except Exception as e:
-        logger.error(f"Error sending contact email: {str(e)}")
+    if settings.email_configured:
+        outbox_worker.notify()
+        if settings.serverless:
+            # No long-running worker on serverless: deliver once the response is sent
+            background_tasks.add_task(outbox_worker.drain)
     
     return contact
 
 
 @router.get("/", response_model=list[ContactResponse])
 async def get_contacts(
+    response: Response,
+    cursor: str | None = None,
     skip: int = 0,
     limit: int = 100,
-    db: AsyncSession = Depends(get_db)
+    db: AsyncSession = Depends(get_read_db)
 ):
     """
     Get all contact submissions (Admin endpoint)
     
-    - **skip**: Number of records to skip
+    - **cursor**: Value of the X-Next-Cursor header from the previous page
+    - **skip**: Number of records to skip (ignored when cursor is set)
     - **limit**: Maximum number of records to return
     """
-    result = await db.execute(
-        select(Contact).offset(skip).limit(limit).order_by(Contact.created_at.desc())
+    return await fetch_page(
+        db, select(Contact), Contact.created_at, Contact.id,
+        response, cursor=cursor, skip=skip, limit=limit
     )
-    contacts = result.scalars().all()
-    return contacts
 
 
 @router.get("/{contact_id}", response_model=ContactResponse)
 async def get_contact(
     contact_id: int,
-    db: AsyncSession = Depends(get_db)
+    db: AsyncSession = Depends(get_read_db)
 ):
     """Get a specific contact by ID"""
     result = await db.execute(select(Contact).where(Contact.id == contact_id))
@@ -1,23 +1,79 @@
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import APIRouter, BackgroundTasks, Depends, HTTPException, Query, Response, status
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import select
-from typing import List
+from sqlalchemy import select, update, delete, or_, func
+from sqlalchemy.orm import raiseload
+from collections import Counter
+from typing import List, Literal
 
-from app.database import get_db
+from app.database import get_db, get_read_db, upsert
 from app.models.content import Category, Post, Project
 from app.schemas import (
     CategoryCreate, CategoryResponse,
-    PostCreate, PostUpdate, PostResponse,
-    ProjectCreate, ProjectUpdate, ProjectResponse
+    PostCreate, PostBatchItem, PostUpdate, PostResponse, PostSummary,
+    ProjectCreate, ProjectUpdate, ProjectResponse, ProjectSummary,
+    BatchResult, SearchResult
 )
+from app.pagination import fetch_page
+from app.projection import parse_fields, load_columns, project
+from app.cache import category_cache, post_slug_cache, project_slug_cache
+from app.response_cache import response_cache
+from app.search import search_content
+from app.markdown_render import render_post, render_posts
+from app.view_counter import view_counter
+from app.config import get_settings
 
 router = APIRouter(prefix="/api/content", tags=["content"])
 
+def _check_batch(rows: list[dict]):
+    if len(rows) > get_settings().content_batch_max_items:
+        raise HTTPException(status_code=413, detail=f"At most {get_settings().content_batch_max_items} items per batch")
+    duplicates = sorted(slug for slug, count in Counter(row["slug"] for row in rows).items() if count > 1)
+    if duplicates:
+        raise HTTPException(status_code=400, detail=f"Duplicate slugs in batch: {', '.join(duplicates)}")
+
+async def _upsert_by_slug(db: AsyncSession, model, rows: list[dict], on_conflict: str) -> BatchResult:
+    """
+    Insert rows, or update/skip those whose slug exists, in one transaction.
+    One SELECT finds existing slugs; the INSERT ... ON CONFLICT (slug) ... RETURNING
+    is sent as multi-row statements (SQLAlchemy batches executemany into VALUES pages).
+    """
+    if not rows:
+        return BatchResult(created=0, updated=0)
+    slugs = [row["slug"] for row in rows]
+    existing = set((await db.execute(select(model.slug).where(model.slug.in_(slugs)))).scalars().all())
+
+    table = model.__table__
+    statement = upsert(db, table)
+    if on_conflict == "update":
+        statement = statement.on_conflict_do_update(
+            index_elements=["slug"],
+            set_={
+                **{key: statement.excluded[key] for key in rows[0] if key != "slug"},
+                "updated_at": func.now(),
+            },
+        )
+    else:
+        statement = statement.on_conflict_do_nothing(index_elements=["slug"])
+    result = await db.execute(statement.returning(table.c.id, table.c.slug), rows)
+    ids = {slug: row_id for row_id, slug in result.all()}
+    await db.commit()
+
+    items = [
+        {"id": ids[slug], "slug": slug, "created": slug not in existing}
+        for slug in slugs if slug in ids
+    ]
+    created = sum(1 for item in items if item["created"])
+    return BatchResult(
+        created=created,
+        updated=len(items) - created,
+        skipped=[slug for slug in slugs if slug not in ids],
+        items=items,
+    )
+
 # --- Categories ---
 @router.get("/categories", response_model=List[CategoryResponse])
-async def get_categories(db: AsyncSession = Depends(get_db)):
-    result = await db.execute(select(Category))
-    return result.scalars().all()
+async def get_categories(db: AsyncSession = Depends(get_read_db)):
+    return await category_cache.all(db)
 
 @router.post("/categories", response_model=CategoryResponse, status_code=status.HTTP_201_CREATED)
 async def create_category(category: CategoryCreate, db: AsyncSession = Depends(get_db)):
@@ -25,60 +81,205 @@ async def create_category(category: CategoryCreate, db: AsyncSession = Depends(g
     db.add(db_category)
     await db.commit()
     await db.refresh(db_category)
+    category_cache.invalidate()
+    response_cache.bump("categories")
     return db_category
 
 # --- Posts ---
 @router.get("/posts", response_model=List[PostResponse])
-async def get_posts(skip: int = 0, limit: int = 100, db: AsyncSession = Depends(get_db)):
-    result = await db.execute(select(Post).offset(skip).limit(limit))
-    return result.scalars().all()
+async def get_posts(
+    response: Response,
+    cursor: str | None = None,
+    skip: int = 0,
+    limit: int = 100,
+    view: Literal["full", "summary"] = "full",
+    fields: str | None = None,
+    db: AsyncSession = Depends(get_read_db)
+):
+    """
+    List posts, oldest first
+    
+    - **view**: `summary` returns list-card fields only (no content body)
+    - **fields**: Comma-separated sparse fieldset, e.g. `title,slug,excerpt`
+    """
+    field_names = parse_fields(fields, Post.__table__.c.keys())
+    query = select(Post)
+    if field_names:
+        query = query.options(load_columns(Post, field_names), raiseload(Post.category))
+    elif view == "summary":
+        query = query.options(load_columns(Post, PostSummary.model_fields))
+
+    posts = await fetch_page(
+        db, query, Post.created_at, Post.id,
+        response, cursor=cursor, skip=skip, limit=limit, descending=False
+    )
+    if field_names or view == "summary":
+        return project(posts, response, PostSummary, field_names)
+    return posts
 
 @router.post("/posts", response_model=PostResponse, status_code=status.HTTP_201_CREATED)
 async def create_post(post: PostCreate, db: AsyncSession = Depends(get_db)):
-    db_post = Post(**post.model_dump())
+    # Render before touching the database so no connection is held meanwhile
+    db_post = Post(**post.model_dump(), **await render_post(post.content))
     db.add(db_post)
     await db.commit()
     await db.refresh(db_post)
+    response_cache.bump("posts")
+    post_slug_cache.put(db_post.slug, PostResponse.model_validate(db_post))
     return db_post
 
+@router.post("/posts/batch", response_model=BatchResult)
+async def create_posts_batch(
+    posts: List[PostBatchItem],
+    on_conflict: Literal["update", "skip"] = "update",
+    db: AsyncSession = Depends(get_db)
+):
+    """
+    Create or upsert posts by slug in one transaction
+    
+    - **on_conflict**: `update` overwrites posts whose slug exists, `skip` leaves them
+    - Each item may give `category_slug` instead of `category_id`
+    """
+    rows = [post.model_dump(exclude={"category_slug"}) for post in posts]
+    _check_batch(rows)
+    for row, rendered in zip(rows, await render_posts([post.content for post in posts])):
+        row.update(rendered)
+
+    # Resolve and check every referenced category in one query
+    category_ids = {post.category_id for post in posts if post.category_id is not None}
+    category_slugs = {post.category_slug for post in posts if post.category_slug is not None}
+    if category_ids or category_slugs:
+        result = await db.execute(
+            select(Category.id, Category.slug).where(
+                or_(Category.id.in_(category_ids), Category.slug.in_(category_slugs))
+            )
+        )
+        known = result.all()
+        known_ids = {category_id for category_id, _ in known}
+        by_slug = {slug: category_id for category_id, slug in known}
+        missing = sorted(
+            [str(category_id) for category_id in category_ids - known_ids]
+            + [slug for slug in category_slugs if slug not in by_slug]
+        )
+        if missing:
+            raise HTTPException(status_code=400, detail=f"Unknown categories: {', '.join(missing)}")
+        for row, post in zip(rows, posts):
+            if post.category_slug is not None:
+                row["category_id"] = by_slug[post.category_slug]
+
+    batch = await _upsert_by_slug(db, Post, rows, on_conflict)
+    response_cache.bump("posts")
+    for item in batch.items:
+        post_slug_cache.discard(item.slug)
+    return batch
+
+@router.get("/posts/by-slug/{slug}", response_model=PostResponse)
+async def get_post_by_slug(slug: str, db: AsyncSession = Depends(get_read_db)):
+    cached = post_slug_cache.get(slug)
+    if cached is not None:
+        return cached
+    result = await db.execute(select(Post).where(Post.slug == slug))
+    post = result.scalar_one_or_none()
+    if not post:
+        raise HTTPException(status_code=404, detail="Post not found")
+    response = PostResponse.model_validate(post)
+    post_slug_cache.put(slug, response)
+    return response
+
 @router.get("/posts/{post_id}", response_model=PostResponse)
-async def get_post(post_id: int, db: AsyncSession = Depends(get_db)):
+async def get_post(post_id: int, db: AsyncSession = Depends(get_read_db)):
     result = await db.execute(select(Post).where(Post.id == post_id))
     post = result.scalar_one_or_none()
     if not post:
         raise HTTPException(status_code=404, detail="Post not found")
     return post
 
+@router.post("/posts/{post_id}/view", status_code=status.HTTP_202_ACCEPTED)
+async def record_post_view(post_id: int, background_tasks: BackgroundTasks):
+    """
+    Count a page view
+    
+    Views are batched in memory and written to Post.views periodically;
+    on serverless there is no background flusher, so flush after responding.
+    """
+    view_counter.record(post_id)
+    if get_settings().serverless:
+        background_tasks.add_task(view_counter.flush)
+    return {"status": "accepted"}
+
 @router.put("/posts/{post_id}", response_model=PostResponse)
 async def update_post(post_id: int, post_update: PostUpdate, db: AsyncSession = Depends(get_db)):
-    result = await db.execute(select(Post).where(Post.id == post_id))
-    db_post = result.scalar_one_or_none()
-    if not db_post:
-        raise HTTPException(status_code=404, detail="Post not found")
-
     update_data = post_update.model_dump(exclude_unset=True)
-    for key, value in update_data.items():
-        setattr(db_post, key, value)
+    if not update_data:
+        return await get_post(post_id, db)
+    if update_data.get("content") is not None:
+        update_data.update(await render_post(update_data["content"]))
 
+    # One UPDATE ... RETURNING instead of SELECT, UPDATE and refresh
+    result = await db.execute(
+        update(Post)
+        .where(Post.id == post_id)
+        .values(**update_data)
+        .returning(*Post.__table__.c)
+        .execution_options(synchronize_session=False)
+    )
+    row = result.mappings().first()
+    if row is None:
+        raise HTTPException(status_code=404, detail="Post not found")
     await db.commit()
-    await db.refresh(db_post)
-    return db_post
+
+    post = PostResponse.model_validate({**row, "category": await category_cache.get(db, row["category_id"])})
+    response_cache.bump("posts")
+    post_slug_cache.discard_id(post_id)
+    post_slug_cache.put(post.slug, post)
+    return post
 
 @router.delete("/posts/{post_id}", status_code=status.HTTP_204_NO_CONTENT)
 async def delete_post(post_id: int, db: AsyncSession = Depends(get_db)):
-    result = await db.execute(select(Post).where(Post.id == post_id))
-    post = result.scalar_one_or_none()
-    if not post:
+    result = await db.execute(
+        delete(Post)
+        .where(Post.id == post_id)
+        .returning(Post.slug)
+        .execution_options(synchronize_session=False)
+    )
+    slug = result.scalar_one_or_none()
+    if slug is None:
         raise HTTPException(status_code=404, detail="Post not found")
-    
-    await db.delete(post)
     await db.commit()
+    response_cache.bump("posts")
+    post_slug_cache.discard(slug)
 
 # --- Projects ---
 @router.get("/projects", response_model=List[ProjectResponse])
-async def get_projects(skip: int = 0, limit: int = 100, db: AsyncSession = Depends(get_db)):
-    result = await db.execute(select(Project).offset(skip).limit(limit))
-    return result.scalars().all()
+async def get_projects(
+    response: Response,
+    cursor: str | None = None,
+    skip: int = 0,
+    limit: int = 100,
+    view: Literal["full", "summary"] = "full",
+    fields: str | None = None,
+    db: AsyncSession = Depends(get_read_db)
+):
+    """
+    List projects, oldest first
+    
+    - **view**: `summary` returns list-card fields only (no content body)
+    - **fields**: Comma-separated sparse fieldset, e.g. `title,slug,description`
+    """
+    field_names = parse_fields(fields, Project.__table__.c.keys())
+    query = select(Project)
+    if field_names:
+        query = query.options(load_columns(Project, field_names))
+    elif view == "summary":
+        query = query.options(load_columns(Project, ProjectSummary.model_fields))
+
+    projects = await fetch_page(
+        db, query, Project.created_at, Project.id,
+        response, cursor=cursor, skip=skip, limit=limit, descending=False
+    )
+    if field_names or view == "summary":
+        return project(projects, response, ProjectSummary, field_names)
+    return projects
 
 @router.post("/projects", response_model=ProjectResponse, status_code=status.HTTP_201_CREATED)
 async def create_project(project: ProjectCreate, db: AsyncSession = Depends(get_db)):
@@ -86,10 +287,44 @@ async def create_project(project: ProjectCreate, db: AsyncSession = Depends(get_
     db.add(db_project)
     await db.commit()
     await db.refresh(db_project)
+    response_cache.bump("projects")
+    project_slug_cache.put(db_project.slug, ProjectResponse.model_validate(db_project))
     return db_project
 
+@router.post("/projects/batch", response_model=BatchResult)
+async def create_projects_batch(
+    projects: List[ProjectCreate],
+    on_conflict: Literal["update", "skip"] = "update",
+    db: AsyncSession = Depends(get_db)
+):
+    """
+    Create or upsert projects by slug in one transaction
+    
+    - **on_conflict**: `update` overwrites projects whose slug exists, `skip` leaves them
+    """
+    rows = [project.model_dump() for project in projects]
+    _check_batch(rows)
+    batch = await _upsert_by_slug(db, Project, rows, on_conflict)
+    response_cache.bump("projects")
+    for item in batch.items:
+        project_slug_cache.discard(item.slug)
+    return batch
+
+@router.get("/projects/by-slug/{slug}", response_model=ProjectResponse)
+async def get_project_by_slug(slug: str, db: AsyncSession = Depends(get_read_db)):
+    cached = project_slug_cache.get(slug)
+    if cached is not None:
+        return cached
+    result = await db.execute(select(Project).where(Project.slug == slug))
+    db_project = result.scalar_one_or_none()
+    if not db_project:
+        raise HTTPException(status_code=404, detail="Project not found")
+    response = ProjectResponse.model_validate(db_project)
+    project_slug_cache.put(slug, response)
+    return response
+
 @router.get("/projects/{project_id}", response_model=ProjectResponse)
-async def get_project(project_id: int, db: AsyncSession = Depends(get_db)):
+async def get_project(project_id: int, db: AsyncSession = Depends(get_read_db)):
     result = await db.execute(select(Project).where(Project.id == project_id))
     project = result.scalar_one_or_none()
     if not project:
@@ -98,25 +333,52 @@ async def get_project(project_id: int, db: AsyncSession = Depends(get_db)):
 
 @router.put("/projects/{project_id}", response_model=ProjectResponse)
 async def update_project(project_id: int, project_update: ProjectUpdate, db: AsyncSession = Depends(get_db)):
-    result = await db.execute(select(Project).where(Project.id == project_id))
-    db_project = result.scalar_one_or_none()
-    if not db_project:
-        raise HTTPException(status_code=404, detail="Project not found")
-
     update_data = project_update.model_dump(exclude_unset=True)
-    for key, value in update_data.items():
-        setattr(db_project, key, value)
+    if not update_data:
+        return await get_project(project_id, db)
 
+    # One UPDATE ... RETURNING instead of SELECT, UPDATE and refresh
+    result = await db.execute(
+        update(Project)
+        .where(Project.id == project_id)
+        .values(**update_data)
+        .returning(*Project.__table__.c)
+        .execution_options(synchronize_session=False)
+    )
+    row = result.mappings().first()
+    if row is None:
+        raise HTTPException(status_code=404, detail="Project not found")
     await db.commit()
-    await db.refresh(db_project)
+
+    db_project = ProjectResponse.model_validate(dict(row))
+    response_cache.bump("projects")
+    project_slug_cache.discard_id(project_id)
+    project_slug_cache.put(db_project.slug, db_project)
     return db_project
 
 @router.delete("/projects/{project_id}", status_code=status.HTTP_204_NO_CONTENT)
 async def delete_project(project_id: int, db: AsyncSession = Depends(get_db)):
-    result = await db.execute(select(Project).where(Project.id == project_id))
-    project = result.scalar_one_or_none()
-    if not project:
+    result = await db.execute(
+        delete(Project)
+        .where(Project.id == project_id)
+        .returning(Project.slug)
+        .execution_options(synchronize_session=False)
+    )
+    slug = result.scalar_one_or_none()
+    if slug is None:
         raise HTTPException(status_code=404, detail="Project not found")
-    
-    await db.delete(project)
     await db.commit()
+    response_cache.bump("projects")
+    project_slug_cache.discard(slug)
+
+# --- Search ---
+@router.get("/search", response_model=List[SearchResult])
+async def search(
+    q: str = Query(..., min_length=1, max_length=200),
+    type: Literal["all", "post", "project"] = "all",
+    skip: int = Query(0, ge=0),
+    limit: int = Query(20, ge=1, le=100),
+    db: AsyncSession = Depends(get_read_db)
+):
+    """Full-text search over posts and projects, best match first"""
+    return await search_content(db, q, kind=type, skip=skip, limit=limit)
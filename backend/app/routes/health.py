@@ -1,8 +1,13 @@
 from fastapi import APIRouter, Depends
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy import text
-from app.database import get_db
-from app.schemas import HealthResponse
+from app.database import get_db, get_pool_status, get_replica_status, get_sqlite_read_pool_status, replica_monitor
+from app.schemas import HealthResponse, PoolStatusResponse, ReplicaStatusResponse, CacheStatsResponse, ViewCounterStatsResponse, AnalyticsStatsResponse, SMTPPoolStatsResponse, PasswordHasherStatsResponse
+from app.response_cache import response_cache
+from app.cache import post_slug_cache, project_slug_cache
+from app.view_counter import view_counter
+from app.analytics import analytics_buffer
+from app.security import password_hasher
 from app.config import get_settings
 
 router = APIRouter(prefix="/api/health", tags=["health"])
@@ -29,3 +34,82 @@ async def health_check(db: AsyncSession = Depends(get_db)):
         "version": settings.app_version,
         "database": db_status
     }
+
+
+@router.get("/pool", response_model=PoolStatusResponse)
+async def pool_status():
+    """
+    Connection pool status
+    
+    Returns pool size, connections in use, overflow and checkout wait times
+    (for SQLite, the primary pool is the single writer and read_pool serves reads)
+    """
+    status = get_pool_status()
+    status["read_pool"] = get_sqlite_read_pool_status()
+    return status
+
+
+@router.get("/replica", response_model=ReplicaStatusResponse)
+async def replica_status():
+    """
+    Read replica status
+    
+    Returns whether read-only routes are currently served by the replica
+    """
+    await replica_monitor.is_usable()
+    return get_replica_status()
+
+
+@router.get("/cache", response_model=CacheStatsResponse)
+async def cache_stats():
+    """
+    Content response cache metrics
+    
+    Returns hit/miss/304 counts, the current resource versions and slug index hits
+    """
+    stats = response_cache.stats()
+    stats["slug_hits"] = post_slug_cache.hits + project_slug_cache.hits
+    stats["slug_misses"] = post_slug_cache.misses + project_slug_cache.misses
+    return stats
+
+
+@router.get("/views", response_model=ViewCounterStatsResponse)
+async def view_counter_stats():
+    """
+    Post view counter metrics
+    
+    Returns views waiting to be written and totals flushed so far
+    """
+    return view_counter.stats()
+
+
+@router.get("/analytics", response_model=AnalyticsStatsResponse)
+async def analytics_stats():
+    """
+    Analytics pipeline metrics
+    
+    Returns buffered, dropped and flushed page-view event counts
+    """
+    return analytics_buffer.stats()
+
+
+@router.get("/email", response_model=SMTPPoolStatsResponse)
+async def email_stats():
+    """
+    SMTP connection pool metrics
+    
+    Returns handshake and send counts and per-send latency
+    """
+    # Imported here so the SMTP client isn't loaded on cold start
+    from app.email_service import smtp_pool
+    return smtp_pool.stats()
+
+
+@router.get("/hashing", response_model=PasswordHasherStatsResponse)
+async def hashing_stats():
+    """
+    Password hashing pool metrics
+    
+    Returns queue depth and bcrypt latency (including time spent queued)
+    """
+    return password_hasher.stats()
@@ -1,10 +1,11 @@
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import APIRouter, Depends, HTTPException, Response, status
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import select
-from sqlalchemy.exc import IntegrityError
-from app.database import get_db
+from sqlalchemy import select, update
+from app.database import get_db, get_read_db, upsert
 from app.models.contact import Newsletter
 from app.schemas import NewsletterCreate, NewsletterResponse
+from app.pagination import fetch_page
+from app.campaigns import verify_unsubscribe_token
 
 router = APIRouter(prefix="/api/newsletter", tags=["newsletter"])
 
@@ -19,42 +20,24 @@ async def subscribe_newsletter(
     
     - **email**: Valid email address
     """
-    # Check if email already exists
-    result = await db.execute(
-        select(Newsletter).where(Newsletter.email == newsletter_data.email)
-    )
-    existing = result.scalar_one_or_none()
-    
-    if existing:
-        if existing.is_active:
-            raise HTTPException(
-                status_code=status.HTTP_400_BAD_REQUEST,
-                detail="Email is already subscribed to newsletter"
-            )
-        else:
-            # Reactivate subscription
-            existing.is_active = 1
-            await db.commit()
-            await db.refresh(existing)
-            return existing
+    # One round trip: insert, or reactivate an unsubscribed row. An active row
+    # doesn't match the DO UPDATE ... WHERE, so nothing is returned for it
+    statement = upsert(db, Newsletter.__table__).values(email=newsletter_data.email, is_active=1)
+    statement = statement.on_conflict_do_update(
+        index_elements=["email"],
+        set_={"is_active": 1},
+        where=Newsletter.__table__.c.is_active == 0,
+    ).returning(*Newsletter.__table__.c)
     
-    # Create new subscription
-    newsletter = Newsletter(
-        email=newsletter_data.email,
-        is_active=1
-    )
+    newsletter = (await db.execute(statement)).first()
+    await db.commit()
     
-    try:
-        db.add(newsletter)
-        await db.commit()
-        await db.refresh(newsletter)
-        return newsletter
-    except IntegrityError:
-        await db.rollback()
+    if newsletter is None:
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
-            detail="Email already exists"
+            detail="Email is already subscribed to newsletter"
         )
+    return newsletter
 
 
 @router.post("/unsubscribe/{email}", status_code=status.HTTP_200_OK)
@@ -68,17 +51,42 @@ async def unsubscribe_newsletter(
     - **email**: Email to unsubscribe
     """
     result = await db.execute(
-        select(Newsletter).where(Newsletter.email == email)
+        update(Newsletter)
+        .where(Newsletter.email == email)
+        .values(is_active=0)
+        .returning(Newsletter.id)
+        .execution_options(synchronize_session=False)
     )
-    newsletter = result.scalar_one_or_none()
+    newsletter_id = result.scalar_one_or_none()
+    await db.commit()
     
-    if not newsletter:
+    if newsletter_id is None:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail="Email not found in newsletter list"
         )
     
-    newsletter.is_active = 0
+    return {"message": "Successfully unsubscribed from newsletter"}
+
+
+@router.api_route("/unsubscribe", methods=["GET", "POST"], status_code=status.HTTP_200_OK)
+async def unsubscribe_with_token(
+    email: str,
+    token: str,
+    db: AsyncSession = Depends(get_db)
+):
+    """
+    Unsubscribe via the signed link in campaign emails
+    
+    POST supports one-click unsubscribe (List-Unsubscribe-Post) from mail clients.
+    """
+    if not verify_unsubscribe_token(email, token):
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="Invalid unsubscribe link"
+        )
+    
+    await db.execute(update(Newsletter).where(Newsletter.email == email).values(is_active=0))
     await db.commit()
     
     return {"message": "Successfully unsubscribed from newsletter"}
@@ -86,23 +94,27 @@ async def unsubscribe_newsletter(
 
 @router.get("/subscribers", response_model=list[NewsletterResponse])
 async def get_subscribers(
+    response: Response,
+    cursor: str | None = None,
     skip: int = 0,
     limit: int = 100,
     active_only: bool = True,
-    db: AsyncSession = Depends(get_db)
+    db: AsyncSession = Depends(get_read_db)
 ):
     """
     Get all newsletter subscribers (Admin endpoint)
     
-    - **skip**: Number of records to skip
+    - **cursor**: Value of the X-Next-Cursor header from the previous page
+    - **skip**: Number of records to skip (ignored when cursor is set)
     - **limit**: Maximum number of records to return
     - **active_only**: Filter only active subscriptions
     """
-    query = select(Newsletter).offset(skip).limit(limit).order_by(Newsletter.subscribed_at.desc())
+    query = select(Newsletter)
     
     if active_only:
         query = query.where(Newsletter.is_active == 1)
     
-    result = await db.execute(query)
-    subscribers = result.scalars().all()
-    return subscribers
+    return await fetch_page(
+        db, query, Newsletter.subscribed_at, Newsletter.id,
+        response, cursor=cursor, skip=skip, limit=limit
+    )
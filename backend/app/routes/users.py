@@ -1,44 +1,44 @@
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import APIRouter, Depends, HTTPException, Request, Response, status
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import select
+from sqlalchemy import select, insert, delete
+from sqlalchemy.exc import IntegrityError
 from sqlalchemy.orm import selectinload
-from typing import List
-import bcrypt
+from sqlalchemy.orm.attributes import set_committed_value
+from typing import List, Literal
 
-from app.database import get_db
+from app.database import get_db, get_read_db
 from app.models.user import User, UserImage
-from app.schemas import UserCreate, UserUpdate, UserResponse
+from app.schemas import UserCreate, UserUpdate, UserResponse, UserImportResponse
+from app.pagination import fetch_page
+from app.security import get_password_hash
 
 router = APIRouter(prefix="/api/users", tags=["users"])
 
-def get_password_hash(password: str) -> str:
-    """Hash a password using bcrypt"""
-    # Bcrypt has a max password length of 72 bytes
-    password_bytes = password.encode('utf-8')[:72]
-    salt = bcrypt.gensalt()
-    return bcrypt.hashpw(password_bytes, salt).decode('utf-8')
-
-def verify_password(plain_password: str, hashed_password: str) -> bool:
-    """Verify a password against a hash"""
-    password_bytes = plain_password.encode('utf-8')[:72]
-    hashed_bytes = hashed_password.encode('utf-8')
-    return bcrypt.checkpw(password_bytes, hashed_bytes)
+async def _insert_images(db: AsyncSession, user_id: int, image_urls) -> list[UserImage]:
+    """Insert a user's images in one bulk INSERT ... RETURNING"""
+    rows = [{"user_id": user_id, "image_url": image_url} for image_url in image_urls]
+    if not rows:
+        return []
+    result = await db.execute(insert(UserImage).returning(UserImage), rows)
+    return sorted(result.scalars().all(), key=lambda image: image.id)
 
 @router.get("/", response_model=List[UserResponse])
-async def get_users(skip: int = 0, limit: int = 100, db: AsyncSession = Depends(get_db)):
-    result = await db.execute(
-        select(User).options(selectinload(User.images)).offset(skip).limit(limit)
+async def get_users(
+    response: Response,
+    cursor: str | None = None,
+    skip: int = 0,
+    limit: int = 100,
+    db: AsyncSession = Depends(get_read_db)
+):
+    return await fetch_page(
+        db, select(User).options(selectinload(User.images)), User.created_at, User.id,
+        response, cursor=cursor, skip=skip, limit=limit, descending=False
     )
-    return result.scalars().all()
 
 @router.post("/", response_model=UserResponse, status_code=status.HTTP_201_CREATED)
 async def create_user(user: UserCreate, db: AsyncSession = Depends(get_db)):
-    # Check if user exists
-    result = await db.execute(select(User).where((User.username == user.username) | (User.email == user.email)))
-    if result.scalar_one_or_none():
-        raise HTTPException(status_code=400, detail="Username or email already registered")
-
-    hashed_password = get_password_hash(user.password)
+    # Hash before touching the database so no connection is held while bcrypt runs
+    hashed_password = await get_password_hash(user.password)
     db_user = User(
         username=user.username,
         email=user.email,
@@ -49,25 +49,34 @@ async def create_user(user: UserCreate, db: AsyncSession = Depends(get_db)):
         dob=user.dob
     )
     db.add(db_user)
-    await db.commit()
-    await db.refresh(db_user)
-
-    # Add images
-    if user.images:
-        for image_url in user.images:
-            db_image = UserImage(user_id=db_user.id, image_url=image_url)
-            db.add(db_image)
+    # One transaction: INSERT user ... RETURNING, then one bulk INSERT ... RETURNING
+    # for the images; no refresh or re-select afterwards
+    try:
+        await db.flush()
+        images = await _insert_images(db, db_user.id, dict.fromkeys(user.images or []))
         await db.commit()
-        await db.refresh(db_user)
-    
-    # Reload with images
-    result = await db.execute(
-        select(User).options(selectinload(User.images)).where(User.id == db_user.id)
-    )
-    return result.scalar_one()
+    except IntegrityError:
+        await db.rollback()
+        raise HTTPException(status_code=400, detail="Username or email already registered")
+    set_committed_value(db_user, "images", images)
+    return db_user
+
+@router.post("/import", response_model=UserImportResponse)
+async def import_users(
+    request: Request,
+    format: Literal["csv", "jsonl"] = "csv",
+    db: AsyncSession = Depends(get_db)
+):
+    """
+    Bulk-create users from a CSV or JSONL request body (streamed, not buffered).
+    Rows that fail validation or clash with existing users are reported per line;
+    the rest are created.
+    """
+    from app.user_import import import_users as run_import, iter_lines
+    return await run_import(db, iter_lines(request.stream()), format)
 
 @router.get("/{user_id}", response_model=UserResponse)
-async def get_user(user_id: int, db: AsyncSession = Depends(get_db)):
+async def get_user(user_id: int, db: AsyncSession = Depends(get_read_db)):
     result = await db.execute(
         select(User).options(selectinload(User.images)).where(User.id == user_id)
     )
@@ -78,6 +87,12 @@ async def get_user(user_id: int, db: AsyncSession = Depends(get_db)):
 
 @router.put("/{user_id}", response_model=UserResponse)
 async def update_user(user_id: int, user_update: UserUpdate, db: AsyncSession = Depends(get_db)):
+    update_data = user_update.model_dump(exclude_unset=True)
+    
+    # Handle password separately (hashed before the user row is read)
+    if "password" in update_data:
+        update_data["hashed_password"] = await get_password_hash(update_data.pop("password"))
+    
     result = await db.execute(
         select(User).options(selectinload(User.images)).where(User.id == user_id)
     )
@@ -85,47 +100,46 @@ async def update_user(user_id: int, user_update: UserUpdate, db: AsyncSession =
     if not db_user:
         raise HTTPException(status_code=404, detail="User not found")
 
-    update_data = user_update.model_dump(exclude_unset=True)
-    
-    # Handle password separately
-    if "password" in update_data:
-        update_data["hashed_password"] = get_password_hash(update_data.pop("password"))
-    
-    # Handle images separately
+    # Handle images separately: diff against the current gallery so only
+    # removed URLs are deleted and only new ones inserted
+    images = None
     if "images" in update_data:
-        images = update_data.pop("images")
-        
-        # Delete existing images using raw SQL to avoid prepared statement issues
-        from sqlalchemy import delete
-        await db.execute(
-            delete(UserImage).where(UserImage.user_id == db_user.id)
-        )
-        await db.flush()  # Execute the delete immediately
-        
-        # Add new images
-        if images:
-            for image_url in images:
-                db_image = UserImage(user_id=db_user.id, image_url=image_url)
-                db.add(db_image)
+        # Ordered and deduplicated, with O(1) membership for large galleries
+        wanted = dict.fromkeys(update_data.pop("images") or [])
+        kept, removed = {}, []
+        for image in db_user.images:
+            if image.image_url in wanted and image.image_url not in kept:
+                kept[image.image_url] = image
+            else:
+                removed.append(image.id)
+        if removed:
+            await db.execute(delete(UserImage).where(UserImage.id.in_(removed)))
+        added = await _insert_images(db, db_user.id, [url for url in wanted if url not in kept])
+        images = [*kept.values(), *added]
 
     for key, value in update_data.items():
         setattr(db_user, key, value)
 
-    await db.commit()
-    await db.refresh(db_user)
-    
-    # Reload with images
-    result = await db.execute(
-        select(User).options(selectinload(User.images)).where(User.id == db_user.id)
-    )
-    return result.scalar_one()
+    try:
+        await db.commit()
+    except IntegrityError:
+        await db.rollback()
+        raise HTTPException(status_code=400, detail="Username or email already registered")
+    if images is not None:
+        set_committed_value(db_user, "images", images)
+    return db_user
 
 @router.delete("/{user_id}", status_code=status.HTTP_204_NO_CONTENT)
 async def delete_user(user_id: int, db: AsyncSession = Depends(get_db)):
-    result = await db.execute(select(User).where(User.id == user_id))
-    user = result.scalar_one_or_none()
-    if not user:
+    # Images first: SQLite tables have no ON DELETE CASCADE
+    await db.execute(delete(UserImage).where(UserImage.user_id == user_id))
+    result = await db.execute(
+        delete(User)
+        .where(User.id == user_id)
+        .returning(User.id)
+        .execution_options(synchronize_session=False)
+    )
+    if result.first() is None:
+        await db.rollback()
         raise HTTPException(status_code=404, detail="User not found")
-    
-    await db.delete(user)
     await db.commit()
@@ -1,6 +1,6 @@
 from pydantic import BaseModel, EmailStr, Field
 from datetime import datetime, date
-from typing import Optional, List
+from typing import Optional, List, Literal
 
 
 class ContactCreate(BaseModel):
@@ -42,6 +42,95 @@ class NewsletterResponse(BaseModel):
         from_attributes = True
 
 
+class CampaignCreate(BaseModel):
+    """Schema for a newsletter campaign; bodies may use $email and $unsubscribe_url"""
+    subject: str = Field(..., min_length=1, max_length=255)
+    body_text: str = Field(..., min_length=1)
+    body_html: Optional[str] = None
+
+
+class CampaignResponse(BaseModel):
+    """Schema for campaign status and progress"""
+    id: int
+    subject: str
+    status: str
+    last_subscriber_id: int
+    sent_count: int
+    failed_count: int
+    created_at: datetime
+    started_at: Optional[datetime] = None
+    completed_at: Optional[datetime] = None
+
+    class Config:
+        from_attributes = True
+
+
+class CampaignDeliveryResponse(BaseModel):
+    """Schema for a per-recipient campaign delivery"""
+    subscriber_id: int
+    email: str
+    status: str
+    error: Optional[str] = None
+    attempted_at: datetime
+
+    class Config:
+        from_attributes = True
+
+
+class PageViewCreate(BaseModel):
+    """Schema for an analytics page view"""
+    path: str = Field(..., min_length=1, max_length=255)
+    referrer: Optional[str] = Field(None, max_length=255)
+
+
+class AnalyticsStatsResponse(BaseModel):
+    """Analytics ingestion buffer state"""
+    buffered: int
+    dropped: int
+    flushes: int
+    flushed_events: int
+
+
+class OutboxMessageResponse(BaseModel):
+    """Schema for a queued or dead-lettered email"""
+    id: int
+    kind: str
+    status: str
+    attempts: int
+    next_attempt_at: datetime
+    last_error: Optional[str] = None
+    created_at: datetime
+    sent_at: Optional[datetime] = None
+
+    class Config:
+        from_attributes = True
+
+
+class SMTPPoolStatsResponse(BaseModel):
+    """SMTP connection pool metrics"""
+    pool_size: int
+    idle_connections: int
+    handshakes: int
+    sends: int
+    failures: int
+    avg_send_ms: float
+    max_send_ms: float
+
+
+class PasswordHasherStatsResponse(BaseModel):
+    """Password hashing pool metrics"""
+    workers: int
+    bcrypt_rounds: int
+    in_flight: int
+    queued: int
+    max_in_flight: int
+    hashes: int
+    verifies: int
+    avg_ms: float
+    max_ms: float
+    avg_queue_wait_ms: float
+
+
 class HealthResponse(BaseModel):
     """Schema for health check response"""
     status: str
@@ -49,6 +138,49 @@ class HealthResponse(BaseModel):
     database: str
 
 
+class PoolStatusResponse(BaseModel):
+    """Schema for connection pool status"""
+    pool_class: str
+    size: Optional[int] = None
+    checked_in: Optional[int] = None
+    checked_out: Optional[int] = None
+    overflow: Optional[int] = None
+    checkouts: int
+    timeouts: int
+    avg_checkout_ms: float
+    max_checkout_ms: float
+    read_pool: Optional["PoolStatusResponse"] = None
+
+
+class CacheStatsResponse(BaseModel):
+    """Schema for content response cache metrics"""
+    entries: int
+    hits: int
+    misses: int
+    not_modified: int
+    hit_ratio: float
+    versions: dict[str, int]
+    slug_hits: int = 0
+    slug_misses: int = 0
+
+
+class ViewCounterStatsResponse(BaseModel):
+    """Write-behind view counter state"""
+    pending_posts: int
+    pending_views: int
+    flushes: int
+    flushed_views: int
+
+
+class ReplicaStatusResponse(BaseModel):
+    """Schema for read replica status"""
+    configured: bool
+    healthy: bool
+    lag_seconds: Optional[float] = None
+    last_error: Optional[str] = None
+    pool: Optional[PoolStatusResponse] = None
+
+
 # --- User Schemas ---
 class UserImageBase(BaseModel):
     image_url: str
@@ -94,6 +226,17 @@ class UserResponse(UserBase):
     class Config:
         from_attributes = True
 
+class UserImportError(BaseModel):
+    line: int
+    username: Optional[str] = None
+    error: str
+
+class UserImportResponse(BaseModel):
+    total: int
+    created: int
+    failed: int
+    errors: List[UserImportError] = []
+
 
 # --- Content Schemas ---
 class CategoryBase(BaseModel):
@@ -130,9 +273,20 @@ class PostUpdate(BaseModel):
     image_url: Optional[str] = None
     category_id: Optional[int] = None
 
+class TocEntry(BaseModel):
+    id: str
+    name: str  # Plain text (not HTML)
+    level: int
+    children: List["TocEntry"] = []
+
 class PostResponse(PostBase):
     id: int
     views: int
+    content_html: Optional[str] = None  # Sanitized HTML rendered from content
+    toc: Optional[List[TocEntry]] = None
+    auto_excerpt: Optional[str] = None
+    word_count: Optional[int] = None
+    reading_time: Optional[int] = None  # Minutes
     created_at: datetime
     updated_at: Optional[datetime] = None
     category: Optional[CategoryResponse] = None
@@ -140,6 +294,29 @@ class PostResponse(PostBase):
     class Config:
         from_attributes = True
 
+class PostBatchItem(PostCreate):
+    category_slug: Optional[str] = None  # Alternative to category_id
+
+class PostSummary(BaseModel):
+    """Post fields for list views (no content body)"""
+    id: int
+    title: str
+    slug: str
+    excerpt: Optional[str] = None
+    auto_excerpt: Optional[str] = None  # Derived from the body; show when excerpt is empty
+    word_count: Optional[int] = None
+    reading_time: Optional[int] = None  # Minutes
+    status: str
+    image_url: Optional[str] = None
+    category_id: Optional[int] = None
+    category: Optional[CategoryResponse] = None
+    views: int
+    created_at: datetime
+    updated_at: Optional[datetime] = None
+
+    class Config:
+        from_attributes = True
+
 class ProjectBase(BaseModel):
     title: str
     slug: str
@@ -170,3 +347,40 @@ class ProjectResponse(ProjectBase):
 
     class Config:
         from_attributes = True
+
+class ProjectSummary(BaseModel):
+    """Project fields for list views (no content body)"""
+    id: int
+    title: str
+    slug: str
+    description: str
+    image_url: Optional[str] = None
+    project_url: Optional[str] = None
+    github_url: Optional[str] = None
+    status: str
+    created_at: datetime
+    updated_at: Optional[datetime] = None
+
+    class Config:
+        from_attributes = True
+
+class BatchItemResult(BaseModel):
+    id: int
+    slug: str
+    created: bool  # False when an existing row with this slug was updated
+
+class BatchResult(BaseModel):
+    created: int
+    updated: int
+    skipped: List[str] = []  # Existing slugs left untouched (on_conflict=skip)
+    items: List[BatchItemResult] = []
+
+
+class SearchResult(BaseModel):
+    """A ranked full-text match; snippet is HTML-escaped with <mark> highlights"""
+    kind: Literal["post", "project"]
+    id: int
+    title: str
+    slug: str
+    snippet: str
+    rank: float
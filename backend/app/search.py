@@ -0,0 +1,202 @@
+"""
+Full-text search over posts and projects
+
+SQLite: an FTS5 table (content_search) kept in sync by triggers on posts and
+projects. Postgres: generated, weighted tsvector columns with GIN indexes
+(see scripts/add_search_index.sql). Both are maintained by the database on
+every insert/update/delete, so the index is always incremental and
+transactional with the write.
+"""
+import html
+import re
+
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.config import get_settings
+
+# Snippet highlight markers; replaced with <mark> after HTML-escaping the snippet
+_HL_START, _HL_END = "\x02", "\x03"
+
+# FTS rowids: posts use even ids, projects odd, so rows can be replaced by rowid
+_SQLITE_SCHEMA = [
+    """
+    CREATE VIRTUAL TABLE IF NOT EXISTS content_search USING fts5(
+        kind UNINDEXED, ref_id UNINDEXED, slug UNINDEXED, title, summary, body,
+        tokenize = 'unicode61 remove_diacritics 2'
+    )
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS posts_search_insert AFTER INSERT ON posts BEGIN
+        INSERT INTO content_search(rowid, kind, ref_id, slug, title, summary, body)
+        VALUES (new.id * 2, 'post', new.id, new.slug, new.title, coalesce(new.excerpt, ''), new.content);
+    END
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS posts_search_update AFTER UPDATE OF title, slug, excerpt, content ON posts BEGIN
+        DELETE FROM content_search WHERE rowid = old.id * 2;
+        INSERT INTO content_search(rowid, kind, ref_id, slug, title, summary, body)
+        VALUES (new.id * 2, 'post', new.id, new.slug, new.title, coalesce(new.excerpt, ''), new.content);
+    END
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS posts_search_delete AFTER DELETE ON posts BEGIN
+        DELETE FROM content_search WHERE rowid = old.id * 2;
+    END
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS projects_search_insert AFTER INSERT ON projects BEGIN
+        INSERT INTO content_search(rowid, kind, ref_id, slug, title, summary, body)
+        VALUES (new.id * 2 + 1, 'project', new.id, new.slug, new.title, new.description, coalesce(new.content, ''));
+    END
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS projects_search_update AFTER UPDATE OF title, slug, description, content ON projects BEGIN
+        DELETE FROM content_search WHERE rowid = old.id * 2 + 1;
+        INSERT INTO content_search(rowid, kind, ref_id, slug, title, summary, body)
+        VALUES (new.id * 2 + 1, 'project', new.id, new.slug, new.title, new.description, coalesce(new.content, ''));
+    END
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS projects_search_delete AFTER DELETE ON projects BEGIN
+        DELETE FROM content_search WHERE rowid = old.id * 2 + 1;
+    END
+    """,
+]
+
+_SQLITE_BACKFILL = [
+    """
+    INSERT INTO content_search(rowid, kind, ref_id, slug, title, summary, body)
+    SELECT id * 2, 'post', id, slug, title, coalesce(excerpt, ''), content FROM posts
+    """,
+    """
+    INSERT INTO content_search(rowid, kind, ref_id, slug, title, summary, body)
+    SELECT id * 2 + 1, 'project', id, slug, title, description, coalesce(content, '') FROM projects
+    """,
+]
+
+
+def _postgres_schema(config: str) -> list[str]:
+    return [
+        f"""
+        ALTER TABLE posts ADD COLUMN IF NOT EXISTS search_vector tsvector GENERATED ALWAYS AS (
+            setweight(to_tsvector('{config}', coalesce(title, '')), 'A') ||
+            setweight(to_tsvector('{config}', coalesce(excerpt, '')), 'B') ||
+            setweight(to_tsvector('{config}', coalesce(content, '')), 'C')
+        ) STORED
+        """,
+        "CREATE INDEX IF NOT EXISTS ix_posts_search_vector ON posts USING GIN (search_vector)",
+        f"""
+        ALTER TABLE projects ADD COLUMN IF NOT EXISTS search_vector tsvector GENERATED ALWAYS AS (
+            setweight(to_tsvector('{config}', coalesce(title, '')), 'A') ||
+            setweight(to_tsvector('{config}', coalesce(description, '')), 'B') ||
+            setweight(to_tsvector('{config}', coalesce(content, '')), 'C')
+        ) STORED
+        """,
+        "CREATE INDEX IF NOT EXISTS ix_projects_search_vector ON projects USING GIN (search_vector)",
+    ]
+
+
+def init_search(connection):
+    """Create the search index for the connection's dialect (run via conn.run_sync)"""
+    if connection.dialect.name == "sqlite":
+        exists = connection.exec_driver_sql(
+            "SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'content_search'"
+        ).first()
+        for statement in _SQLITE_SCHEMA:
+            connection.exec_driver_sql(statement)
+        if not exists:
+            # First run on an existing database: index the rows already there
+            for statement in _SQLITE_BACKFILL:
+                connection.exec_driver_sql(statement)
+    elif connection.dialect.name == "postgresql":
+        for statement in _postgres_schema(get_settings().search_language):
+            connection.exec_driver_sql(statement)
+
+
+def _fts5_query(query: str) -> str | None:
+    """User input -> FTS5 query: every word must match, as a prefix"""
+    terms = re.findall(r"\w+", query, re.UNICODE)
+    if not terms:
+        return None
+    return " ".join(f'"{term}"*' for term in terms)
+
+
+def _highlight(snippet: str | None) -> str:
+    escaped = html.escape(snippet or "")
+    return escaped.replace(_HL_START, "<mark>").replace(_HL_END, "</mark>")
+
+
+async def search_content(db: AsyncSession, query: str, kind: str = "all", skip: int = 0, limit: int = 20) -> list[dict]:
+    """Ranked matches across posts and projects, best first, with highlighted snippets"""
+    if db.get_bind().dialect.name == "postgresql":
+        rows = await _search_postgres(db, query, kind, skip, limit)
+    else:
+        rows = await _search_sqlite(db, query, kind, skip, limit)
+    return [
+        {
+            "kind": row.kind,
+            "id": row.id,
+            "title": row.title,
+            "slug": row.slug,
+            "snippet": _highlight(row.snippet),
+            "rank": float(row.rank),
+        }
+        for row in rows
+    ]
+
+
+async def _search_sqlite(db: AsyncSession, query: str, kind: str, skip: int, limit: int):
+    match = _fts5_query(query)
+    if match is None:
+        return []
+    kind_filter = "AND kind = :kind" if kind != "all" else ""
+    result = await db.execute(
+        text(f"""
+            SELECT kind, ref_id AS id, title, slug,
+                   snippet(content_search, -1, :hl_start, :hl_end, '…', 24) AS snippet,
+                   -bm25(content_search, 0, 0, 0, 10.0, 4.0, 1.0) AS rank
+            FROM content_search
+            WHERE content_search MATCH :match {kind_filter}
+            ORDER BY bm25(content_search, 0, 0, 0, 10.0, 4.0, 1.0)
+            LIMIT :limit OFFSET :skip
+        """),
+        {"match": match, "kind": kind, "hl_start": _HL_START, "hl_end": _HL_END, "limit": limit, "skip": skip},
+    )
+    return result.all()
+
+
+async def _search_postgres(db: AsyncSession, query: str, kind: str, skip: int, limit: int):
+    config = get_settings().search_language
+    parts = []
+    if kind in ("all", "post"):
+        parts.append(
+            "SELECT 'post' AS kind, p.id, p.title, p.slug, p.content AS body, "
+            "ts_rank_cd(p.search_vector, q.query) AS rank "
+            "FROM posts p, q WHERE p.search_vector @@ q.query"
+        )
+    if kind in ("all", "project"):
+        parts.append(
+            "SELECT 'project' AS kind, pr.id, pr.title, pr.slug, "
+            "coalesce(pr.content, pr.description) AS body, "
+            "ts_rank_cd(pr.search_vector, q.query) AS rank "
+            "FROM projects pr, q WHERE pr.search_vector @@ q.query"
+        )
+    # ts_headline is expensive, so only run it for the rows on this page
+    result = await db.execute(
+        text(f"""
+            WITH q AS (SELECT websearch_to_tsquery(CAST(:config AS regconfig), :query) AS query),
+            page AS (
+                {" UNION ALL ".join(parts)}
+                ORDER BY rank DESC, id DESC
+                LIMIT :limit OFFSET :skip
+            )
+            SELECT page.kind, page.id, page.title, page.slug, page.rank,
+                   ts_headline(CAST(:config AS regconfig), page.body, q.query,
+                               'StartSel=' || :hl_start || ', StopSel=' || :hl_end || ', MaxWords=35, MinWords=15') AS snippet
+            FROM page, q
+            ORDER BY page.rank DESC, page.id DESC
+        """),
+        {"query": query, "config": config, "hl_start": _HL_START, "hl_end": _HL_END, "limit": limit, "skip": skip},
+    )
+    return result.all()
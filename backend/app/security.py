@@ -0,0 +1,113 @@
+"""
+Password hashing off the event loop
+
+bcrypt is deliberately slow (~100-300 ms per call at the default cost) and
+would block every other request if called from an async handler. Hashing and
+verification run on a dedicated thread pool of password_hash_workers threads
+(bcrypt releases the GIL while it works), so at most that many run at once and
+the rest queue. Queue depth and latency are tracked for /api/health/hashing.
+"""
+import asyncio
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from app.config import get_settings
+
+
+def hash_password_sync(password: str, rounds: int | None = None) -> str:
+    """bcrypt hash (blocking; also used from process pools by bulk imports)"""
+    import bcrypt  # Deferred: only user writes need it, keep it off the cold-start path
+    # Bcrypt has a max password length of 72 bytes
+    password_bytes = password.encode('utf-8')[:72]
+    salt = bcrypt.gensalt(rounds=rounds or get_settings().bcrypt_rounds)
+    return bcrypt.hashpw(password_bytes, salt).decode('utf-8')
+
+
+def verify_password_sync(plain_password: str, hashed_password: str) -> bool:
+    """Check a password against a bcrypt hash (blocking)"""
+    import bcrypt
+    password_bytes = plain_password.encode('utf-8')[:72]
+    hashed_bytes = hashed_password.encode('utf-8')
+    return bcrypt.checkpw(password_bytes, hashed_bytes)
+
+
+class PasswordHasher:
+    def __init__(self):
+        self._executor: ThreadPoolExecutor | None = None
+        self.in_flight = 0
+        self.max_in_flight = 0
+        self.hashes = 0
+        self.verifies = 0
+        self.total_ms = 0.0
+        self.max_ms = 0.0
+        self.total_wait_ms = 0.0
+
+    @property
+    def workers(self) -> int:
+        return get_settings().password_hash_workers
+
+    def _pool(self) -> ThreadPoolExecutor:
+        if self._executor is None:
+            self._executor = ThreadPoolExecutor(max_workers=self.workers, thread_name_prefix="bcrypt")
+        return self._executor
+
+    async def _run(self, func, *args):
+        submitted = time.perf_counter()
+        started = []
+
+        def timed():
+            started.append(time.perf_counter())
+            return func(*args)
+
+        self.in_flight += 1
+        self.max_in_flight = max(self.max_in_flight, self.in_flight)
+        try:
+            return await asyncio.get_running_loop().run_in_executor(self._pool(), timed)
+        finally:
+            self.in_flight -= 1
+            elapsed_ms = (time.perf_counter() - submitted) * 1000
+            self.total_ms += elapsed_ms
+            self.max_ms = max(self.max_ms, elapsed_ms)
+            if started:
+                self.total_wait_ms += (started[0] - submitted) * 1000
+
+    async def hash(self, password: str) -> str:
+        self.hashes += 1
+        return await self._run(hash_password_sync, password)
+
+    async def verify(self, plain_password: str, hashed_password: str) -> bool:
+        self.verifies += 1
+        return await self._run(verify_password_sync, plain_password, hashed_password)
+
+    def shutdown(self):
+        if self._executor is not None:
+            self._executor.shutdown(wait=False, cancel_futures=True)
+            self._executor = None
+
+    def stats(self) -> dict:
+        calls = self.hashes + self.verifies
+        return {
+            "workers": self.workers,
+            "bcrypt_rounds": get_settings().bcrypt_rounds,
+            "in_flight": self.in_flight,
+            "queued": max(self.in_flight - self.workers, 0),
+            "max_in_flight": self.max_in_flight,
+            "hashes": self.hashes,
+            "verifies": self.verifies,
+            "avg_ms": round(self.total_ms / calls, 2) if calls else 0.0,
+            "max_ms": round(self.max_ms, 2),
+            "avg_queue_wait_ms": round(self.total_wait_ms / calls, 2) if calls else 0.0,
+        }
+
+
+password_hasher = PasswordHasher()
+
+
+async def get_password_hash(password: str) -> str:
+    """Hash a password on the hashing pool"""
+    return await password_hasher.hash(password)
+
+
+async def verify_password(plain_password: str, hashed_password: str) -> bool:
+    """Verify a password on the hashing pool"""
+    return await password_hasher.verify(plain_password, hashed_password)
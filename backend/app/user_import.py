@@ -0,0 +1,240 @@
+"""
+Bulk user import from CSV or JSONL
+
+Input is consumed as a stream of lines and processed import_batch_size rows
+at a time, so any file size runs in bounded memory. For each batch:
+
+1. every row is validated against UserCreate
+2. usernames/emails are checked for duplicates within the file and against
+   the database with one set-based query
+3. passwords are hashed in parallel on a process pool (all cores by default;
+   HTTP imports share one long-lived pool, see app/process_pool.py)
+4. users go in with one multi-row INSERT ... ON CONFLICT DO NOTHING RETURNING
+   (a concurrent signup that wins the race becomes a row error, not a failed
+   batch), then their images with one multi-row INSERT, and the batch commits
+
+A bad row is reported with its line number and never aborts the import;
+a CSV header that can't be read fails the whole import with a 400.
+
+CSV columns: username,email,password[,role,is_active,full_name,dob,images]
+where images is a "|"-separated list of URLs. JSONL: one UserCreate object per line.
+"""
+import asyncio
+import csv
+import json
+from concurrent.futures import ProcessPoolExecutor
+from functools import partial
+from typing import AsyncIterator
+
+from fastapi import HTTPException, status
+from pydantic import ValidationError
+from sqlalchemy import select, or_, insert
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.config import get_settings
+from app.database import upsert
+from app.models.user import User, UserImage
+from app.process_pool import SharedProcessPool, spawn_executor
+from app.schemas import UserCreate
+from app.security import hash_password_sync
+
+
+async def iter_lines(chunks: AsyncIterator[bytes]) -> AsyncIterator[bytes]:
+    """Split a byte stream (e.g. request.stream()) into raw lines (decoded per row by iter_records)"""
+    buffer = b""
+    async for chunk in chunks:
+        buffer += chunk
+        *lines, buffer = buffer.split(b"\n")
+        for line in lines:
+            yield line
+    if buffer:
+        yield buffer
+
+
+_REQUIRED_COLUMNS = ("username", "email", "password")
+
+
+def _csv_header(raw: bytes) -> list[str]:
+    """Column names from the header line; an unusable header fails the import"""
+    try:
+        header = [name.strip() for name in next(csv.reader([raw.decode("utf-8-sig").rstrip("\r")]))]
+    except (ValueError, StopIteration) as e:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"Could not parse CSV header: {e}"
+        )
+    missing = [name for name in _REQUIRED_COLUMNS if name not in header]
+    if missing:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"CSV header is missing column(s): {', '.join(missing)}"
+        )
+    return header
+
+
+def _csv_record(header: list[str], line: str) -> dict:
+    values = next(csv.reader([line]))
+    if len(values) != len(header):
+        raise ValueError(f"Expected {len(header)} columns, got {len(values)}")
+    record = {key: value for key, value in zip(header, values) if value != ""}
+    if "images" in record:
+        record["images"] = [url.strip() for url in record["images"].split("|") if url.strip()]
+    return record
+
+
+async def iter_records(lines: AsyncIterator[bytes], fmt: str) -> AsyncIterator[tuple[int, dict | None, str | None]]:
+    """(line number, record, parse error) for every non-empty data line"""
+    header = None
+    line_number = 0
+    async for raw in lines:
+        line_number += 1
+        if not raw.strip():
+            continue
+        if fmt == "csv" and header is None:
+            # The first non-empty line is the header even if it is unusable;
+            # a data row is never promoted to header
+            header = _csv_header(raw)
+            continue
+        try:
+            # Decoded here so one bad line is a row error, not a failed import
+            line = raw.decode("utf-8-sig").rstrip("\r")
+            record = _csv_record(header, line) if fmt == "csv" else json.loads(line)
+            if not isinstance(record, dict):
+                raise ValueError("Expected a JSON object")
+            yield line_number, record, None
+        except (ValueError, StopIteration) as e:
+            yield line_number, None, f"Could not parse line: {e}"
+
+
+def _validation_message(error: ValidationError) -> str:
+    return "; ".join(f"{'.'.join(str(p) for p in e['loc'])}: {e['msg']}" for e in error.errors())
+
+
+class UserImporter:
+    def __init__(self, db: AsyncSession, executor: ProcessPoolExecutor):
+        self.db = db
+        self.executor = executor
+        self.total = 0
+        self.created = 0
+        self.errors: list[dict] = []
+
+    def _fail(self, line: int, error: str, username: str | None = None):
+        self.errors.append({"line": line, "username": username, "error": error})
+
+    async def run(self, records: AsyncIterator[tuple[int, dict | None, str | None]]) -> dict:
+        batch_size = get_settings().import_batch_size
+        batch = []
+        async for line, record, error in records:
+            self.total += 1
+            if error:
+                self._fail(line, error)
+                continue
+            try:
+                batch.append((line, UserCreate.model_validate(record)))
+            except ValidationError as e:
+                self._fail(line, _validation_message(e), record.get("username"))
+            if len(batch) >= batch_size:
+                await self._import_batch(batch)
+                batch = []
+        if batch:
+            await self._import_batch(batch)
+
+        self.errors.sort(key=lambda e: e["line"])
+        return {
+            "total": self.total,
+            "created": self.created,
+            "failed": len(self.errors),
+            "errors": self.errors,
+        }
+
+    async def _import_batch(self, batch: list[tuple[int, UserCreate]]):
+        # Duplicates within the file: first occurrence wins
+        seen_usernames, seen_emails, unique = set(), set(), []
+        for line, user in batch:
+            if user.username in seen_usernames or user.email in seen_emails:
+                self._fail(line, "Duplicate username or email in import", user.username)
+                continue
+            seen_usernames.add(user.username)
+            seen_emails.add(user.email)
+            unique.append((line, user))
+
+        # Duplicates against the database: one query for the whole batch
+        result = await self.db.execute(
+            select(User.username, User.email).where(
+                or_(User.username.in_(seen_usernames), User.email.in_(seen_emails))
+            )
+        )
+        taken_usernames, taken_emails = set(), set()
+        for username, email in result.all():
+            taken_usernames.add(username)
+            taken_emails.add(email)
+        # Release the connection while hashing (SQLite has a single writer)
+        await self.db.rollback()
+
+        rows = []
+        for line, user in unique:
+            if user.username in taken_usernames or user.email in taken_emails:
+                self._fail(line, "Username or email already registered", user.username)
+            else:
+                rows.append((line, user))
+        if not rows:
+            return
+
+        # bcrypt on every core
+        loop = asyncio.get_running_loop()
+        hash_one = partial(hash_password_sync, rounds=get_settings().bcrypt_rounds)
+        hashes = await asyncio.gather(*(
+            loop.run_in_executor(self.executor, hash_one, user.password) for _, user in rows
+        ))
+
+        user_values = [
+            {
+                "username": user.username,
+                "email": user.email,
+                "hashed_password": hashed,
+                "role": user.role,
+                "is_active": user.is_active,
+                "full_name": user.full_name,
+                "dob": user.dob,
+            }
+            for (_, user), hashed in zip(rows, hashes)
+        ]
+        statement = (
+            upsert(self.db, User.__table__)
+            .values(user_values)
+            .on_conflict_do_nothing()
+            .returning(User.__table__.c.id, User.__table__.c.username)
+        )
+        inserted = dict((username, user_id) for user_id, username in (await self.db.execute(statement)).all())
+
+        image_values = []
+        for line, user in rows:
+            user_id = inserted.get(user.username)
+            if user_id is None:
+                self._fail(line, "Username or email already registered", user.username)
+                continue
+            image_values.extend(
+                {"user_id": user_id, "image_url": image_url}
+                for image_url in dict.fromkeys(user.images or [])
+            )
+        if image_values:
+            await self.db.execute(insert(UserImage.__table__).values(image_values))
+        await self.db.commit()
+        self.created += len(inserted)
+
+
+# Shared by HTTP imports; shut down in the app lifespan
+hashing_pool = SharedProcessPool(lambda: get_settings().import_hash_processes)
+
+
+def hashing_executor() -> ProcessPoolExecutor:
+    """A private hashing pool for one-off runs (scripts/import_users.py)"""
+    return spawn_executor(get_settings().import_hash_processes)
+
+
+async def import_users(
+    db: AsyncSession, lines: AsyncIterator[bytes], fmt: str, executor: ProcessPoolExecutor | None = None
+) -> dict:
+    """Import users from CSV/JSONL lines; returns counts and per-line errors"""
+    # HTTP imports hash on the shared pool; scripts pass a pool of their own
+    return await UserImporter(db, executor or hashing_pool.executor).run(iter_records(lines, fmt))
@@ -0,0 +1,108 @@
+"""
+Write-behind view counter for Post.views
+
+Page views are tallied in memory per post id and written back in a single
+UPDATE (views = views + CASE id ... END) every view_flush_interval seconds,
+or sooner once view_flush_events views are pending. A hot post therefore
+costs one row update per flush instead of one per view. Counts only move
+forward in the database, so cached post responses may show slightly stale
+view totals until they expire.
+"""
+import asyncio
+import logging
+
+from sqlalchemy import case, func, update
+
+from app.config import get_settings
+from app.database import AsyncSessionLocal
+from app.models.content import Post
+
+logger = logging.getLogger(__name__)
+
+
+class ViewCounter:
+    def __init__(self):
+        self._pending: dict[int, int] = {}
+        self._pending_events = 0
+        self._wake = asyncio.Event()
+        self._task: asyncio.Task | None = None
+        self._stopping = False
+        self._flush_lock = asyncio.Lock()
+        self.flushes = 0
+        self.flushed_views = 0
+
+    def record(self, post_id: int, count: int = 1):
+        """Count a view; never touches the database"""
+        self._pending[post_id] = self._pending.get(post_id, 0) + count
+        self._pending_events += count
+        if self._pending_events >= get_settings().view_flush_events:
+            self._wake.set()
+
+    async def flush(self) -> int:
+        """Write all pending counts in one UPDATE; returns the number of views written"""
+        async with self._flush_lock:
+            if not self._pending:
+                return 0
+            pending, self._pending = self._pending, {}
+            self._pending_events = 0
+
+            increment = case(pending, value=Post.id, else_=0)
+            statement = (
+                update(Post.__table__)
+                .where(Post.id.in_(list(pending)))
+                # Keep updated_at as is: a view isn't an edit (skips the column's onupdate)
+                .values(views=func.coalesce(Post.views, 0) + increment, updated_at=Post.updated_at)
+            )
+            try:
+                async with AsyncSessionLocal() as session:
+                    await session.execute(statement)
+                    await session.commit()
+            except Exception as e:
+                # Put the counts back so the next scheduled flush retries them
+                for post_id, count in pending.items():
+                    self._pending[post_id] = self._pending.get(post_id, 0) + count
+                self._pending_events += sum(pending.values())
+                logger.warning(f"View count flush failed, will retry: {e}")
+                return 0
+
+            total = sum(pending.values())
+            self.flushes += 1
+            self.flushed_views += total
+            return total
+
+    async def _run(self):
+        interval = get_settings().view_flush_interval
+        while not self._stopping:
+            try:
+                await asyncio.wait_for(self._wake.wait(), timeout=interval)
+            except asyncio.TimeoutError:
+                pass
+            self._wake.clear()
+            await self.flush()
+
+    def start(self):
+        if self._task is None:
+            self._stopping = False
+            self._wake = asyncio.Event()  # Bound to the running loop
+            self._task = asyncio.create_task(self._run())
+
+    async def stop(self):
+        """Stop the background task and write whatever is still pending"""
+        if self._task is not None:
+            # Let an in-flight flush finish rather than cancelling it halfway
+            self._stopping = True
+            self._wake.set()
+            await self._task
+            self._task = None
+        await self.flush()
+
+    def stats(self) -> dict:
+        return {
+            "pending_posts": len(self._pending),
+            "pending_views": self._pending_events,
+            "flushes": self.flushes,
+            "flushed_views": self.flushed_views,
+        }
+
+
+view_counter = ViewCounter()
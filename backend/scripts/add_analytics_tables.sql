@@ -0,0 +1,21 @@
+-- Page-view analytics tables (raw events + hourly/daily rollups)
+-- Run this in Supabase SQL Editor. SQLite creates them on startup.
+
+CREATE TABLE IF NOT EXISTS page_view_events (
+    id BIGSERIAL PRIMARY KEY,
+    path VARCHAR(255) NOT NULL,
+    referrer VARCHAR(255),
+    occurred_at TIMESTAMP NOT NULL,
+    recorded_at TIMESTAMP WITH TIME ZONE DEFAULT CURRENT_TIMESTAMP NOT NULL
+);
+CREATE INDEX IF NOT EXISTS ix_page_view_events_occurred_at ON page_view_events(occurred_at);
+
+CREATE TABLE IF NOT EXISTS page_views_hourly (
+    hour TIMESTAMP PRIMARY KEY,
+    views INTEGER DEFAULT 0 NOT NULL
+);
+
+CREATE TABLE IF NOT EXISTS page_views_daily (
+    day DATE PRIMARY KEY,
+    views INTEGER DEFAULT 0 NOT NULL
+);
@@ -0,0 +1,29 @@
+-- Newsletter campaigns and per-recipient deliveries
+-- Run this in Supabase SQL Editor. SQLite creates them on startup.
+
+CREATE TABLE IF NOT EXISTS campaigns (
+    id SERIAL PRIMARY KEY,
+    subject VARCHAR(255) NOT NULL,
+    body_text TEXT NOT NULL,
+    body_html TEXT,
+    status VARCHAR(20) DEFAULT 'draft' NOT NULL,
+    last_subscriber_id INTEGER DEFAULT 0 NOT NULL,
+    lease_expires_at TIMESTAMP,
+    sent_count INTEGER DEFAULT 0 NOT NULL,
+    failed_count INTEGER DEFAULT 0 NOT NULL,
+    created_at TIMESTAMP WITH TIME ZONE DEFAULT CURRENT_TIMESTAMP NOT NULL,
+    started_at TIMESTAMP WITH TIME ZONE,
+    completed_at TIMESTAMP WITH TIME ZONE
+);
+
+CREATE TABLE IF NOT EXISTS campaign_deliveries (
+    id SERIAL PRIMARY KEY,
+    campaign_id INTEGER NOT NULL REFERENCES campaigns(id) ON DELETE CASCADE,
+    subscriber_id INTEGER NOT NULL,
+    email VARCHAR(255) NOT NULL,
+    status VARCHAR(20) NOT NULL,
+    error TEXT,
+    attempted_at TIMESTAMP WITH TIME ZONE DEFAULT CURRENT_TIMESTAMP NOT NULL,
+    CONSTRAINT uq_campaign_deliveries_campaign_subscriber UNIQUE (campaign_id, subscriber_id)
+);
+CREATE INDEX IF NOT EXISTS ix_campaign_deliveries_campaign_status ON campaign_deliveries(campaign_id, status, subscriber_id);
@@ -0,0 +1,8 @@
+-- Composite indexes for keyset (cursor) pagination on list endpoints
+-- Run this in Supabase SQL Editor (also works on SQLite: sqlite3 data/app.db < scripts/add_pagination_indexes.sql)
+
+CREATE INDEX IF NOT EXISTS ix_contacts_created_at_id ON contacts(created_at, id);
+CREATE INDEX IF NOT EXISTS ix_newsletters_subscribed_at_id ON newsletters(subscribed_at, id);
+CREATE INDEX IF NOT EXISTS ix_posts_created_at_id ON posts(created_at, id);
+CREATE INDEX IF NOT EXISTS ix_projects_created_at_id ON projects(created_at, id);
+CREATE INDEX IF NOT EXISTS ix_users_created_at_id ON users(created_at, id);
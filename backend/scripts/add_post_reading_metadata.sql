@@ -0,0 +1,7 @@
+-- Card metadata for posts (derived excerpt, word count, reading time)
+-- Run this in Supabase SQL Editor, then fill existing posts once:
+--     python scripts/render_posts.py
+
+ALTER TABLE posts ADD COLUMN IF NOT EXISTS auto_excerpt TEXT;
+ALTER TABLE posts ADD COLUMN IF NOT EXISTS word_count INTEGER;
+ALTER TABLE posts ADD COLUMN IF NOT EXISTS reading_time INTEGER;
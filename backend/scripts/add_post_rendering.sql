@@ -0,0 +1,7 @@
+-- Rendered Markdown for posts (HTML + table of contents, keyed by content hash)
+-- Run this in Supabase SQL Editor, then render existing posts once:
+--     python scripts/render_posts.py
+
+ALTER TABLE posts ADD COLUMN IF NOT EXISTS content_html TEXT;
+ALTER TABLE posts ADD COLUMN IF NOT EXISTS toc JSON;
+ALTER TABLE posts ADD COLUMN IF NOT EXISTS content_hash VARCHAR(64);
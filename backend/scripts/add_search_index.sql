@@ -0,0 +1,18 @@
+-- Full-text search for /api/content/search (Postgres / Supabase)
+-- Run this in Supabase SQL Editor. Generated columns keep the vectors in sync
+-- on every write; "simple" matches SEARCH_LANGUAGE's default (no stemming,
+-- works for Vietnamese). SQLite builds its FTS5 index on startup instead.
+
+ALTER TABLE posts ADD COLUMN IF NOT EXISTS search_vector tsvector GENERATED ALWAYS AS (
+    setweight(to_tsvector('simple', coalesce(title, '')), 'A') ||
+    setweight(to_tsvector('simple', coalesce(excerpt, '')), 'B') ||
+    setweight(to_tsvector('simple', coalesce(content, '')), 'C')
+) STORED;
+CREATE INDEX IF NOT EXISTS ix_posts_search_vector ON posts USING GIN (search_vector);
+
+ALTER TABLE projects ADD COLUMN IF NOT EXISTS search_vector tsvector GENERATED ALWAYS AS (
+    setweight(to_tsvector('simple', coalesce(title, '')), 'A') ||
+    setweight(to_tsvector('simple', coalesce(description, '')), 'B') ||
+    setweight(to_tsvector('simple', coalesce(content, '')), 'C')
+) STORED;
+CREATE INDEX IF NOT EXISTS ix_projects_search_vector ON projects USING GIN (search_vector);
@@ -0,0 +1,84 @@
+#!/usr/bin/env python3
+"""
+Benchmark event-loop latency while passwords are being hashed
+
+Inline: bcrypt called directly in the coroutine (the old get_password_hash).
+Pool: app.security.get_password_hash, which runs bcrypt on the hashing pool.
+
+N concurrent "signups" hash a password each while a ticker coroutine sleeps
+10 ms in a loop and records how late it wakes up - that lateness is what every
+other request on the worker would see.
+
+Usage:
+    python scripts/bench_password_hashing.py [--signups 20] [--rounds 12] [--workers 2]
+"""
+import argparse
+import asyncio
+import os
+import statistics
+import sys
+import time
+
+# Add parent directory to path to import app modules
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+TICK_SECONDS = 0.010
+
+
+async def measure(hash_one, signups: int) -> dict:
+    lags = []
+    done = asyncio.Event()
+
+    async def ticker():
+        while not done.is_set():
+            start = time.perf_counter()
+            await asyncio.sleep(TICK_SECONDS)
+            lags.append((time.perf_counter() - start - TICK_SECONDS) * 1000)
+
+    ticker_task = asyncio.create_task(ticker())
+    await asyncio.sleep(0)
+    start = time.perf_counter()
+    await asyncio.gather(*(hash_one(f"password-{n}") for n in range(signups)))
+    elapsed = time.perf_counter() - start
+    done.set()
+    await ticker_task
+
+    lags.sort()
+    return {
+        "seconds": elapsed,
+        "hashes_per_second": signups / elapsed,
+        "lag_p50_ms": statistics.median(lags) if lags else 0.0,
+        "lag_p99_ms": lags[int(len(lags) * 0.99) - 1] if lags else 0.0,
+        "lag_max_ms": lags[-1] if lags else 0.0,
+    }
+
+
+def report(label: str, result: dict):
+    print(
+        f"{label:<8} {result['seconds']:6.2f}s  {result['hashes_per_second']:6.1f} hashes/s  "
+        f"loop lag p50 {result['lag_p50_ms']:7.1f} ms  p99 {result['lag_p99_ms']:7.1f} ms  max {result['lag_max_ms']:7.1f} ms"
+    )
+
+
+async def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--signups", type=int, default=20, help="Concurrent password hashes")
+    parser.add_argument("--rounds", type=int, default=12, help="bcrypt cost factor")
+    parser.add_argument("--workers", type=int, default=2, help="Hashing pool threads")
+    args = parser.parse_args()
+
+    os.environ.update(BCRYPT_ROUNDS=str(args.rounds), PASSWORD_HASH_WORKERS=str(args.workers), DEBUG="false")
+    from app.security import get_password_hash, hash_password_sync, password_hasher
+
+    async def inline(password: str):
+        return hash_password_sync(password)
+
+    print(f"{args.signups} concurrent signups, bcrypt rounds={args.rounds}, pool workers={args.workers}")
+    report("inline", await measure(inline, args.signups))
+    report("pool", await measure(get_password_hash, args.signups))
+    print(f"pool stats: {password_hasher.stats()}")
+    password_hasher.shutdown()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
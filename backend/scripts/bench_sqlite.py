@@ -0,0 +1,124 @@
+#!/usr/bin/env python3
+"""
+Benchmark SQLite write/read throughput: default engine vs. production mode
+
+Default: aiosqlite's NullPool, rollback journal, no pragmas (the old setup).
+Production mode: the app's own engines - WAL + tuned pragmas, a single writer
+connection and a read pool (see app/database.py).
+
+Concurrent writers insert contacts while concurrent readers list the latest
+contacts, for a fixed duration against a temporary database file.
+
+Usage:
+    python scripts/bench_sqlite.py [--writers 20] [--readers 20] [--seconds 5]
+"""
+import argparse
+import asyncio
+import os
+import sys
+import tempfile
+import time
+from contextlib import asynccontextmanager
+
+# Add parent directory to path to import app modules
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+TMP_DIR = tempfile.mkdtemp(prefix="bench_sqlite_")
+DB_URL = f"sqlite+aiosqlite:///{os.path.join(TMP_DIR, 'bench.db')}"
+os.environ.update(DATABASE_URL=DB_URL, DEBUG="false", DB_POOL_MODE="queue")
+
+from sqlalchemy import select, text
+from sqlalchemy.exc import OperationalError
+from sqlalchemy.ext.asyncio import create_async_engine, async_sessionmaker, AsyncSession
+
+from app.database import Base, AsyncSessionLocal, ReadSessionLocal, get_engine, get_read_engine, dispose_engines
+from app.models.contact import Contact
+
+
+async def run_load(write_session, read_session, writers: int, readers: int, seconds: float) -> dict:
+    stats = {"writes": 0, "reads": 0, "errors": 0}
+    deadline = time.perf_counter() + seconds
+
+    async def writer(n: int):
+        while time.perf_counter() < deadline:
+            try:
+                async with write_session() as session:
+                    session.add(Contact(
+                        name=f"Bench {n}", email=f"bench{n}@example.com",
+                        subject="Benchmark", message="Benchmark message body",
+                    ))
+                    await session.commit()
+                stats["writes"] += 1
+            except OperationalError:
+                stats["errors"] += 1
+
+    async def reader():
+        while time.perf_counter() < deadline:
+            try:
+                async with read_session() as session:
+                    result = await session.execute(
+                        select(Contact).order_by(Contact.created_at.desc()).limit(20)
+                    )
+                    result.scalars().all()
+                stats["reads"] += 1
+            except OperationalError:
+                stats["errors"] += 1
+
+    await asyncio.gather(
+        *(writer(n) for n in range(writers)),
+        *(reader() for _ in range(readers)),
+    )
+    return stats
+
+
+async def reset_schema(engine):
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.drop_all)
+        await conn.run_sync(Base.metadata.create_all)
+
+
+async def bench_default(args) -> dict:
+    engine = create_async_engine(DB_URL)
+    async with engine.begin() as conn:
+        await conn.execute(text("PRAGMA journal_mode = DELETE"))
+    await reset_schema(engine)
+    sessions = async_sessionmaker(engine, class_=AsyncSession, expire_on_commit=False)
+    stats = await run_load(sessions, sessions, args.writers, args.readers, args.seconds)
+    await engine.dispose()
+    return stats
+
+
+async def bench_production(args) -> dict:
+    await reset_schema(get_engine())
+
+    @asynccontextmanager
+    async def read_session():
+        # Same routing as the get_read_db dependency
+        async with ReadSessionLocal() as session:
+            session.info["read_engine"] = await get_read_engine()
+            yield session
+
+    stats = await run_load(AsyncSessionLocal, read_session, args.writers, args.readers, args.seconds)
+    await dispose_engines()
+    return stats
+
+
+def report(name: str, stats: dict, seconds: float):
+    print(f"{name:<18} writes/s: {stats['writes'] / seconds:8.1f}   "
+          f"reads/s: {stats['reads'] / seconds:8.1f}   errors: {stats['errors']}")
+
+
+async def main():
+    parser = argparse.ArgumentParser(description="SQLite throughput benchmark")
+    parser.add_argument("--writers", type=int, default=20)
+    parser.add_argument("--readers", type=int, default=20)
+    parser.add_argument("--seconds", type=float, default=5.0)
+    args = parser.parse_args()
+
+    print(f"📊 {args.writers} writers + {args.readers} readers for {args.seconds:.0f}s on {TMP_DIR}\n")
+    report("default", await bench_default(args), args.seconds)
+    report("production mode", await bench_production(args), args.seconds)
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -21,6 +21,7 @@ CREATE TABLE IF NOT EXISTS users (
 
 CREATE INDEX IF NOT EXISTS idx_users_username ON users(username);
 CREATE INDEX IF NOT EXISTS idx_users_email ON users(email);
+CREATE INDEX IF NOT EXISTS ix_users_created_at_id ON users(created_at, id);
 
 -- 2. USER IMAGES TABLE (for multiple images per user)
 CREATE TABLE IF NOT EXISTS user_images (
@@ -44,6 +45,7 @@ CREATE TABLE IF NOT EXISTS contacts (
 );
 
 CREATE INDEX IF NOT EXISTS idx_contacts_email ON contacts(email);
+CREATE INDEX IF NOT EXISTS ix_contacts_created_at_id ON contacts(created_at, id);
 
 -- 4. NEWSLETTERS TABLE
 CREATE TABLE IF NOT EXISTS newsletters (
@@ -54,6 +56,7 @@ CREATE TABLE IF NOT EXISTS newsletters (
 );
 
 CREATE INDEX IF NOT EXISTS idx_newsletters_email ON newsletters(email);
+CREATE INDEX IF NOT EXISTS ix_newsletters_subscribed_at_id ON newsletters(subscribed_at, id);
 
 -- 5. CATEGORIES TABLE
 CREATE TABLE IF NOT EXISTS categories (
@@ -74,6 +77,12 @@ CREATE TABLE IF NOT EXISTS posts (
     status VARCHAR(20) DEFAULT 'draft' NOT NULL,
     views INTEGER DEFAULT 0,
     image_url VARCHAR(255),
+    content_html TEXT,
+    toc JSON,
+    content_hash VARCHAR(64),
+    auto_excerpt TEXT,
+    word_count INTEGER,
+    reading_time INTEGER,
     category_id INTEGER REFERENCES categories(id) ON DELETE SET NULL,
     created_at TIMESTAMP WITH TIME ZONE DEFAULT CURRENT_TIMESTAMP NOT NULL,
     updated_at TIMESTAMP WITH TIME ZONE
@@ -81,6 +90,7 @@ CREATE TABLE IF NOT EXISTS posts (
 
 CREATE INDEX IF NOT EXISTS idx_posts_slug ON posts(slug);
 CREATE INDEX IF NOT EXISTS idx_posts_category_id ON posts(category_id);
+CREATE INDEX IF NOT EXISTS ix_posts_created_at_id ON posts(created_at, id);
 
 -- 7. PROJECTS TABLE
 CREATE TABLE IF NOT EXISTS projects (
@@ -98,6 +108,69 @@ CREATE TABLE IF NOT EXISTS projects (
 );
 
 CREATE INDEX IF NOT EXISTS idx_projects_slug ON projects(slug);
+CREATE INDEX IF NOT EXISTS ix_projects_created_at_id ON projects(created_at, id);
+
+-- 8. PAGE VIEW ANALYTICS (raw events + hourly/daily rollups)
+CREATE TABLE IF NOT EXISTS page_view_events (
+    id BIGSERIAL PRIMARY KEY,
+    path VARCHAR(255) NOT NULL,
+    referrer VARCHAR(255),
+    occurred_at TIMESTAMP NOT NULL,
+    recorded_at TIMESTAMP WITH TIME ZONE DEFAULT CURRENT_TIMESTAMP NOT NULL
+);
+CREATE INDEX IF NOT EXISTS ix_page_view_events_occurred_at ON page_view_events(occurred_at);
+
+CREATE TABLE IF NOT EXISTS page_views_hourly (
+    hour TIMESTAMP PRIMARY KEY,
+    views INTEGER DEFAULT 0 NOT NULL
+);
+
+CREATE TABLE IF NOT EXISTS page_views_daily (
+    day DATE PRIMARY KEY,
+    views INTEGER DEFAULT 0 NOT NULL
+);
+
+-- 9. EMAIL OUTBOX
+CREATE TABLE IF NOT EXISTS email_outbox (
+    id SERIAL PRIMARY KEY,
+    kind VARCHAR(50) NOT NULL,
+    payload TEXT NOT NULL,
+    status VARCHAR(20) DEFAULT 'pending' NOT NULL,
+    attempts INTEGER DEFAULT 0 NOT NULL,
+    next_attempt_at TIMESTAMP NOT NULL,
+    last_error TEXT,
+    created_at TIMESTAMP WITH TIME ZONE DEFAULT CURRENT_TIMESTAMP NOT NULL,
+    sent_at TIMESTAMP WITH TIME ZONE
+);
+CREATE INDEX IF NOT EXISTS ix_email_outbox_status_next_attempt_at ON email_outbox(status, next_attempt_at);
+
+-- 10. NEWSLETTER CAMPAIGNS
+CREATE TABLE IF NOT EXISTS campaigns (
+    id SERIAL PRIMARY KEY,
+    subject VARCHAR(255) NOT NULL,
+    body_text TEXT NOT NULL,
+    body_html TEXT,
+    status VARCHAR(20) DEFAULT 'draft' NOT NULL,
+    last_subscriber_id INTEGER DEFAULT 0 NOT NULL,
+    lease_expires_at TIMESTAMP,
+    sent_count INTEGER DEFAULT 0 NOT NULL,
+    failed_count INTEGER DEFAULT 0 NOT NULL,
+    created_at TIMESTAMP WITH TIME ZONE DEFAULT CURRENT_TIMESTAMP NOT NULL,
+    started_at TIMESTAMP WITH TIME ZONE,
+    completed_at TIMESTAMP WITH TIME ZONE
+);
+
+CREATE TABLE IF NOT EXISTS campaign_deliveries (
+    id SERIAL PRIMARY KEY,
+    campaign_id INTEGER NOT NULL REFERENCES campaigns(id) ON DELETE CASCADE,
+    subscriber_id INTEGER NOT NULL,
+    email VARCHAR(255) NOT NULL,
+    status VARCHAR(20) NOT NULL,
+    error TEXT,
+    attempted_at TIMESTAMP WITH TIME ZONE DEFAULT CURRENT_TIMESTAMP NOT NULL,
+    CONSTRAINT uq_campaign_deliveries_campaign_subscriber UNIQUE (campaign_id, subscriber_id)
+);
+CREATE INDEX IF NOT EXISTS ix_campaign_deliveries_campaign_status ON campaign_deliveries(campaign_id, status, subscriber_id);
 
 -- ============================================================
 -- INSERT SAMPLE DATA (Optional - for testing)
@@ -0,0 +1,91 @@
+#!/usr/bin/env python3
+"""
+Measure cold-start import cost of the serverless entry point (api/index.py)
+
+Runs `python -X importtime -c "import api.index"` in fresh interpreters with
+VERCEL=1 and reports the slowest modules. Exits with status 1 when the import
+time exceeds the budget or when a module that should be deferred (SMTP client,
+bcrypt, database drivers, Markdown renderer) is imported at startup, so it can run in CI.
+
+Usage:
+    python scripts/import_time_report.py [--runs 5] [--budget-ms 1500] [--top 15]
+"""
+import argparse
+import os
+import statistics
+import subprocess
+import sys
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# Modules that must only be imported by the routes/first query that need them
+DEFERRED_MODULES = ["aiosmtplib", "bcrypt", "aiosqlite", "psycopg", "app.email_service", "markdown", "nh3"]
+
+
+def measure_once() -> dict:
+    """Import the entry point in a fresh interpreter; return {module: cumulative_us}"""
+    env = dict(os.environ, VERCEL="1", DEBUG="false", PYTHONDONTWRITEBYTECODE="0")
+    proc = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", "import api.index"],
+        cwd=BACKEND_DIR,
+        env=env,
+        capture_output=True,
+        text=True,
+    )
+    if proc.returncode != 0:
+        print(proc.stderr)
+        raise SystemExit("❌ Importing api.index failed")
+
+    modules = {}
+    for line in proc.stderr.splitlines():
+        if not line.startswith("import time:") or "cumulative" in line:
+            continue
+        _, self_us, cumulative_us, name = [part.strip() for part in line.replace("import time:", "|").split("|")]
+        modules[name] = max(modules.get(name, 0), int(cumulative_us))
+    return modules
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--runs", type=int, default=5)
+    parser.add_argument("--budget-ms", type=float, default=1500.0)
+    parser.add_argument("--top", type=int, default=15)
+    args = parser.parse_args()
+
+    # First run warms the bytecode cache so the report reflects a deployed bundle
+    measure_once()
+    runs = [measure_once() for _ in range(args.runs)]
+
+    totals_ms = [run["api.index"] / 1000 for run in runs]
+    median_ms = statistics.median(totals_ms)
+
+    print(f"📦 Cold-start import of api.index ({args.runs} runs)")
+    print(f"   median: {median_ms:.1f} ms   min: {min(totals_ms):.1f} ms   max: {max(totals_ms):.1f} ms")
+    print(f"\nTop {args.top} modules by cumulative import time (median):")
+    names = set().union(*runs)
+    medians = {
+        name: statistics.median(run.get(name, 0) for run in runs) / 1000
+        for name in names
+    }
+    for name, ms in sorted(medians.items(), key=lambda item: item[1], reverse=True)[:args.top]:
+        print(f"   {ms:9.1f} ms  {name}")
+
+    ok = True
+    loaded = [name for name in DEFERRED_MODULES if any(name in run for run in runs)]
+    if loaded:
+        print(f"\n❌ FAIL: deferred modules imported at startup: {', '.join(loaded)}")
+        ok = False
+    else:
+        print(f"\n✅ PASS: deferred modules not imported ({', '.join(DEFERRED_MODULES)})")
+
+    if median_ms > args.budget_ms:
+        print(f"❌ FAIL: median import time {median_ms:.1f} ms exceeds budget {args.budget_ms:.0f} ms")
+        ok = False
+    else:
+        print(f"✅ PASS: median import time within budget ({args.budget_ms:.0f} ms)")
+
+    sys.exit(0 if ok else 1)
+
+
+if __name__ == "__main__":
+    main()
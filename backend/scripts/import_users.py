@@ -0,0 +1,69 @@
+#!/usr/bin/env python3
+"""
+Bulk-import users from a CSV or JSONL file (same rules as POST /api/users/import)
+
+CSV needs a header row: username,email,password[,role,is_active,full_name,dob,images]
+(images is a "|"-separated list of URLs). JSONL is one user object per line.
+Passwords are hashed on a process pool using all cores; rows that fail are
+listed with their line number and the rest are imported.
+
+Usage:
+    python scripts/import_users.py users.csv
+    python scripts/import_users.py users.jsonl [--format jsonl] [--batch-size 500] [--processes 8]
+"""
+import argparse
+import asyncio
+import os
+import sys
+import time
+
+# Add parent directory to path to import app modules
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+
+async def read_lines(path: str):
+    with open(path, "rb") as f:
+        for line in f:
+            yield line.rstrip(b"\r\n")
+
+
+async def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("path", help="CSV or JSONL file")
+    parser.add_argument("--format", choices=["csv", "jsonl"], help="Defaults to the file extension")
+    parser.add_argument("--batch-size", type=int, help="Rows per transaction")
+    parser.add_argument("--processes", type=int, help="Hashing processes (default: all cores)")
+    args = parser.parse_args()
+
+    if args.batch_size:
+        os.environ["IMPORT_BATCH_SIZE"] = str(args.batch_size)
+    if args.processes:
+        os.environ["IMPORT_HASH_PROCESSES"] = str(args.processes)
+    fmt = args.format or ("jsonl" if args.path.endswith((".jsonl", ".ndjson")) else "csv")
+
+    from app.database import AsyncSessionLocal, init_db, dispose_engines
+    from app.user_import import import_users, hashing_executor
+
+    from fastapi import HTTPException
+
+    await init_db()
+    start = time.perf_counter()
+    try:
+        with hashing_executor() as executor:
+            async with AsyncSessionLocal() as session:
+                report = await import_users(session, read_lines(args.path), fmt, executor)
+    except HTTPException as e:
+        print(f"❌ {e.detail}")
+        return 1
+    finally:
+        await dispose_engines()
+    elapsed = time.perf_counter() - start
+
+    for error in report["errors"]:
+        print(f"line {error['line']}: {error['username'] or '-'}: {error['error']}")
+    print(f"✅ {report['created']} created, ❌ {report['failed']} failed of {report['total']} rows in {elapsed:.1f}s")
+    return 1 if report["failed"] else 0
+
+
+if __name__ == "__main__":
+    sys.exit(asyncio.run(main()))
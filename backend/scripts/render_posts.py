@@ -0,0 +1,46 @@
+#!/usr/bin/env python3
+"""
+Render stored posts' Markdown to HTML, table of contents and card metadata
+(auto_excerpt, word_count, reading_time) - backfill
+
+Posts whose content_hash doesn't match their content (never rendered, edited
+outside the API, or rendered by an older RENDERER_VERSION) are rendered on a
+process pool using all cores and updated in batches. Safe to re-run; posts
+that are already up to date are skipped.
+
+Usage:
+    python scripts/render_posts.py [--batch-size 200] [--processes 8] [--force]
+"""
+import argparse
+import asyncio
+import os
+import sys
+import time
+
+# Add parent directory to path to import app modules
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+
+async def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--batch-size", type=int, default=200, help="Posts per read/update batch")
+    parser.add_argument("--processes", type=int, help="Rendering processes (default: all cores)")
+    parser.add_argument("--force", action="store_true", help="Re-render every post")
+    args = parser.parse_args()
+
+    if args.processes:
+        os.environ["MARKDOWN_RENDER_PROCESSES"] = str(args.processes)
+
+    from app.database import init_db, dispose_engines
+    from app.markdown_render import backfill_rendered_posts, render_executor
+
+    await init_db()
+    start = time.perf_counter()
+    with render_executor() as executor:
+        updated = await backfill_rendered_posts(executor, batch_size=args.batch_size, force=args.force)
+    await dispose_engines()
+    print(f"✅ Rendered {updated} posts in {time.perf_counter() - start:.1f}s")
+
+
+if __name__ == "__main__":
+    asyncio.run(main())